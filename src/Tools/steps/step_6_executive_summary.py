@@ -4,7 +4,10 @@ from __future__ import annotations
 import hashlib
 import re
 from datetime import date, datetime
-from typing import Any, Dict, List, Optional, Tuple
+from difflib import unified_diff
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import streamlit as st
 
@@ -24,6 +27,11 @@ SS_EXEC_TEXT = "tool6_exec_summary_text"              # normalized final text (s
 
 SS_EXEC_HASH = "tool6_exec_summary_hash"              # cache hash for auto-generation
 SS_EXEC_AUTO = "tool6_exec_summary_auto_text"         # last generated auto text
+SS_EXEC_AUTO_NORM = "tool6_exec_summary_auto_norm"    # _split_paragraphs(auto text), refreshed with SS_EXEC_AUTO
+SS_EXEC_FAST_KEY = "tool6_exec_summary_fast_key"      # (hash, raw fingerprint inputs) of the last full check
+SS_EXEC_DERIVED = "tool6_exec_summary_derived"        # picked/normalized row fields, refreshed by _ensure_state
+SS_EXEC_DETECTED = "tool6_exec_summary_detected"      # _detect_issue_labels result, refreshed by _ensure_state
+SS_EXEC_DIFF_MEMO = "tool6_exec_summary_diff_memo"    # ((auto, edited), _simple_diff result) of the last shown diff
 
 # Renamed: Approved -> Confirmed (canonical)
 SS_EXEC_CONFIRMED = "tool6_exec_summary_confirmed"    # bool (was tool6_exec_summary_approved)
@@ -42,6 +50,9 @@ SS_EXEC_TEMPLATE = "tool6_exec_summary_template"                  # selected tem
 SS_EXEC_TRANSLATE_TARGET = "tool6_exec_summary_translate_target"  # "English"|"Persian/Dari"
 SS_EXEC_TRANSLATE_SOURCE = "tool6_exec_summary_translate_source"  # "Edited"|"Auto"
 
+# View switcher (only the active view is built per rerun)
+SS_EXEC_VIEW = "tool6_exec_summary_view"  # "Draft"|"Insights"|"Controls"
+
 # Upstream keys
 SS_GENERAL_OVERRIDES = "general_info_overrides"
 SS_WORK = "tool6_work_progress_rows"  # Step 5 output (optional)
@@ -53,6 +64,19 @@ SS_NAV_NEXT_REQUESTED = "tool6_nav_next_requested"
 # CSS injected guard
 SS_S6_CSS_DONE = "tool6_s6_css_done"
 
+# One-time defaults guard for _ensure_state
+SS_S6_STATE_READY = "tool6_s6_state_ready"
+
+
+# Collapses 3+ consecutive newlines into a single blank line (paragraph break)
+_MULTI_NL_RE = re.compile(r"\n{3,}")
+
+# Accepted visit-date layouts (tried in order)
+_DATE_FORMATS = ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d", "%d/%m/%Y", "%m/%d/%Y")
+_DATE_TRANS = str.maketrans({"T": " ", "Z": None})
+# Zero-padded ISO date followed by end or a space: same result as the strptime loop + fallback
+_ISO_DATE_RE = re.compile(r"([0-9]{4}-[0-9]{2}-[0-9]{2})(?: |$)")
+
 
 # =============================================================================
 # Config
@@ -116,6 +140,26 @@ TEMPLATE_LIBRARY: Dict[str, Dict[str, Any]] = {
     },
 }
 
+# Selectbox options + O(1) index lookups (static; avoid rebuilding per rerun)
+_TEMPLATE_NAMES: Tuple[str, ...] = tuple(TEMPLATE_LIBRARY.keys())
+_TEMPLATE_INDEX: Dict[str, int] = {n: i for i, n in enumerate(_TEMPLATE_NAMES)}
+
+_STYLES: Tuple[str, ...] = ("Short", "Standard", "Detailed")
+_STYLE_IDX: Dict[str, int] = {v: i for i, v in enumerate(_STYLES)}
+
+_TONES: Tuple[str, ...] = ("Neutral", "Formal", "Action-oriented")
+_TONE_IDX: Dict[str, int] = {v: i for i, v in enumerate(_TONES)}
+
+_FORMATS: Tuple[str, ...] = ("Paragraphs", "Bullets")
+_FMT_IDX: Dict[str, int] = {v: i for i, v in enumerate(_FORMATS)}
+
+_TR_SOURCES: Tuple[str, ...] = ("Edited", "Auto")
+_TR_SOURCE_IDX: Dict[str, int] = {v: i for i, v in enumerate(_TR_SOURCES)}
+_TR_TARGET_IDX: Dict[str, int] = {v: i for i, v in enumerate(UIConfig.TRANSLATE_TARGETS)}
+
+_VIEWS: Tuple[str, ...] = ("Draft", "Insights", "Controls")
+_VIEW_IDX: Dict[str, int] = {v: i for i, v in enumerate(_VIEWS)}
+
 
 # =============================================================================
 # Small utils
@@ -124,39 +168,58 @@ def _s(v: Any) -> str:
     return "" if v is None else str(v).strip()
 
 
+def _fast_s(v: Any) -> str:
+    # Hash inputs only: no strip (whitespace edits just cost one extra regen check)
+    return "" if v is None else v if type(v) is str else str(v)
+
+
+@lru_cache(maxsize=256)
 def _key(*parts: Any) -> str:
+    # Widget keys are built from constant parts; cache so reruns skip the hashing.
     raw = ".".join(str(p) for p in parts)
-    h = hashlib.md5(raw.encode("utf-8", errors="ignore")).hexdigest()
+    h = hashlib.blake2b(raw.encode("utf-8", errors="ignore"), digest_size=8).hexdigest()
     return f"t6.s6.{h}"
 
 
-def _sha1_text(text: str) -> str:
-    return hashlib.sha1(text.encode("utf-8", errors="ignore")).hexdigest()
+# Widget keys (all-literal parts): hashed once at import, not per rerun
+_K_REGEN = _key("regen")
+_K_RESET_AUTO = _key("reset_auto")
+_K_TPL_NAME = _key("tpl_name")
+_K_TPL_APPLY = _key("tpl_apply")
+_K_STYLE = _key("style")
+_K_TONE = _key("tone")
+_K_FORMAT = _key("format")
+_K_ISSUES_SEL = _key("issues_sel")
+_K_INCLUDE_WORK = _key("include_work")
+_K_APPLY_CONTROLS = _key("apply_controls")
+_K_TR_SOURCE = _key("tr_source")
+_K_TR_TARGET = _key("tr_target")
+_K_TR_NOW = _key("tr_now")
+_K_VIEW = _key("view")
 
 
-def _is_nonempty(v: Any) -> bool:
-    return _s(v) not in ("", " ")
-
-
-def _safe_index(options: List[str], value: str, default_value: str) -> int:
-    v = value if value in options else default_value
-    try:
-        return options.index(v)
-    except Exception:
-        return 0
+def _text_digest(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8", errors="ignore"), digest_size=16).hexdigest()
 
 
 def _pick_first_nonempty(row: Dict[str, Any], overrides: Dict[str, Any], keys) -> Any:
-    keys_list = [keys] if isinstance(keys, str) else list(keys)
-    for k in keys_list:
-        if k in overrides and _is_nonempty(overrides.get(k)):
-            return overrides.get(k)
-    for k in keys_list:
-        if _is_nonempty(row.get(k)):
-            return row.get(k)
+    if isinstance(keys, str):
+        keys = (keys,)
+    # Overrides win over row values; emptiness check inlined (str fast path, else _s semantics)
+    for src in (overrides, row):
+        for k in keys:
+            v = src.get(k)
+            if v is None:
+                continue
+            if v.strip() if isinstance(v, str) else str(v).strip():
+                return v
     return None
 
 
+_YES_TOKENS = frozenset({"yes", "y", "true", "1", "checked", "✔", "✅"})
+_NO_TOKENS = frozenset({"no", "n", "false", "0", "unchecked", "✘", "❌"})
+
+
 def _parse_bool_like(v: Any) -> Optional[bool]:
     if v is None:
         return None
@@ -168,22 +231,14 @@ def _parse_bool_like(v: Any) -> Optional[bool]:
             return True
         if iv == 0:
             return False
-    sv = _s(v).lower()
-    if sv in {"yes", "y", "true", "1", "checked", "✔", "✅"}:
+    sv = (v if isinstance(v, str) else str(v)).strip().lower()
+    if sv in _YES_TOKENS:
         return True
-    if sv in {"no", "n", "false", "0", "unchecked", "✘", "❌"}:
+    if sv in _NO_TOKENS:
         return False
     return None
 
 
-def _as_yes(v: Any) -> bool:
-    return _parse_bool_like(v) is True
-
-
-def _as_no(v: Any) -> bool:
-    return _parse_bool_like(v) is False
-
-
 def _norm_phrase(v: Any) -> str:
     sv = _s(v)
     if not sv:
@@ -203,17 +258,25 @@ def _date_only_isoish(v: Any) -> str:
     sv = _s(v)
     if not sv:
         return ""
+    return _date_only_isoish_str(sv)
 
-    sv_clean = sv.strip().replace("T", " ").replace("Z", "")
+
+@lru_cache(maxsize=128)
+def _date_only_isoish_str(sv: str) -> str:
+    sv_clean = sv.translate(_DATE_TRANS)
     if "." in sv_clean:
         sv_clean = sv_clean.split(".")[0].strip()
 
-    for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d", "%d/%m/%Y", "%m/%d/%Y"):
+    # Common case (ISO starttime): no strptime attempts
+    m = _ISO_DATE_RE.match(sv_clean)
+    if m:
+        return m.group(1)
+
+    for fmt in _DATE_FORMATS:
         try:
-            dt = datetime.strptime(sv_clean, fmt)
-            return dt.date().isoformat()
-        except Exception:
-            pass
+            return datetime.strptime(sv_clean, fmt).date().isoformat()
+        except ValueError:
+            continue
 
     return sv_clean.split(" ")[0].strip()
 
@@ -223,59 +286,85 @@ def _build_location_phrase(village: str, district: str, province: str) -> str:
     return ", ".join(parts)
 
 
+@lru_cache(maxsize=8)
 def _split_paragraphs(text: str) -> str:
-    t = (text or "").replace("\r\n", "\n")
-    t = "\n".join([ln.rstrip() for ln in t.split("\n")])
-    while "\n\n\n" in t:
-        t = t.replace("\n\n\n", "\n\n")
-    return t.strip()
+    # Called several times per rerun on the same editor text; collapse blank runs in one pass.
+    if not text:
+        return ""
+    # splitlines() handles \r\n / \r / \n natively (no separate CRLF replace pass)
+    t = "\n".join(ln.rstrip() for ln in text.splitlines())
+    return _MULTI_NL_RE.sub("\n\n", t).strip()
 
 
-def _render_preview(text: str, fmt: str) -> None:
-    t = _split_paragraphs(text)
+@lru_cache(maxsize=8)
+def _preview_markdown(text: str, fmt: str) -> str:
+    blocks = [b for b in map(str.strip, text.split("\n\n")) if b]
+    if fmt == "Bullets":
+        return "\n\n".join(f"- {b}" for b in blocks)
+    return "\n\n".join(blocks)
+
+
+def _render_preview(text: str, fmt: str, *, normalized: bool = False) -> None:
+    # normalized=True: caller already passed text through _split_paragraphs
+    t = _s(text) if normalized else _split_paragraphs(text)
     if not t:
         st.info("Preview is empty.")
         return
 
-    blocks = [b.strip() for b in t.split("\n\n") if b.strip()]
-    if fmt == "Bullets":
-        for b in blocks:
-            st.markdown(f"- {b}")
-    else:
-        for b in blocks:
-            st.markdown(b)
-            st.write("")
+    # One markdown element instead of one per paragraph (fewer frontend deltas per rerun)
+    st.markdown(_preview_markdown(t, fmt))
+
+
+_DIFF_CONTEXT = 2
+_HUNK_RE = re.compile(r"@@ -(\d+)(,\d+)? \+(\d+)(,\d+)? @@$")
+
+
+def _shift_hunk(line: str, offset: int) -> str:
+    m = _HUNK_RE.match(line)
+    if not m:
+        return line
+    return "@@ -%d%s +%d%s @@" % (int(m.group(1)) + offset, m.group(2) or "", int(m.group(3)) + offset, m.group(4) or "")
 
 
 def _simple_diff(a: str, b: str, max_lines: int = 120) -> str:
     a_lines = (a or "").splitlines()
     b_lines = (b or "").splitlines()
 
-    out: List[str] = []
-    out.append("Legend: - removed | + added |   unchanged")
-    out.append("")
-
-    i = 0
-    j = 0
-    while i < len(a_lines) and j < len(b_lines) and len(out) < max_lines:
-        if a_lines[i] == b_lines[j]:
-            out.append(f"  {a_lines[i]}")
-            i += 1
-            j += 1
-        else:
-            out.append(f"- {a_lines[i]}")
-            out.append(f"+ {b_lines[j]}")
-            i += 1
-            j += 1
-
-    while i < len(a_lines) and len(out) < max_lines:
-        out.append(f"- {a_lines[i]}")
-        i += 1
-    while j < len(b_lines) and len(out) < max_lines:
-        out.append(f"+ {b_lines[j]}")
-        j += 1
-
-    if len(out) >= max_lines:
+    # Linear common prefix/suffix trim: only the edited middle (+ context) reaches SequenceMatcher
+    lim = min(len(a_lines), len(b_lines))
+    lo = 0
+    while lo < lim and a_lines[lo] == b_lines[lo]:
+        lo += 1
+    if lo == len(a_lines) == len(b_lines):
+        return "(no differences)"
+    hi = 0
+    while hi < lim - lo and a_lines[-1 - hi] == b_lines[-1 - hi]:
+        hi += 1
+    start = max(0, lo - _DIFF_CONTEXT)
+    keep_tail = max(0, hi - _DIFF_CONTEXT)
+
+    # Real line alignment + lazy generator capped at max_lines (+1 to detect truncation)
+    diff = list(
+        islice(
+            unified_diff(
+                a_lines[start:len(a_lines) - keep_tail],
+                b_lines[start:len(b_lines) - keep_tail],
+                fromfile="auto",
+                tofile="edited",
+                lineterm="",
+                n=_DIFF_CONTEXT,
+            ),
+            max_lines + 1,
+        )
+    )
+    if not diff:
+        return "(no differences)"
+    if start:
+        diff = [_shift_hunk(ln, start) if ln.startswith("@@") else ln for ln in diff]
+
+    out: List[str] = ["Legend: - removed | + added |   unchanged", ""]
+    out.extend(diff[:max_lines])
+    if len(diff) > max_lines:
         out.append("")
         out.append("… diff truncated …")
 
@@ -286,7 +375,13 @@ def _simple_diff(a: str, b: str, max_lines: int = 120) -> str:
 # Work Progress (Step 5) summary (optional)
 # =============================================================================
 def _safe_float(v: Any) -> float:
-    s = _s(v).replace(",", "").strip()
+    s = _s(v)
+    if not s:
+        return 0.0
+    # Plain integer entries (the usual Planned/Achieved value): no replace, no try/except
+    if s.isascii() and s.isdigit():
+        return float(s)
+    s = s.replace(",", "").strip()
     if not s:
         return 0.0
     try:
@@ -310,23 +405,35 @@ def _parse_progress_percent(progress_text: str) -> int:
 def _work_progress_summary(rows: Any) -> str:
     if not isinstance(rows, list) or not rows:
         return ""
+    # Project only the fields the summary reads -> small, hashable cache key
+    cells = tuple(
+        (r.get("Activities"), r.get("Planned"), r.get("Achieved"), r.get("Progress"))
+        for r in rows
+        if isinstance(r, dict)
+    )
+    return _work_progress_summary_cached(cells)
 
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _work_progress_summary_cached(cells: Tuple[Tuple[Any, Any, Any, Any], ...]) -> str:
     acts = 0
     planned_sum = 0.0
     achieved_sum = 0.0
     prog_sum = 0
     prog_n = 0
+    # Local bindings: the loop body resolves these as fast locals, not module globals
+    s, sf, pp = _s, _safe_float, _parse_progress_percent
 
-    for r in rows:
-        if not isinstance(r, dict):
+    for activity, planned, achieved, progress in cells:
+        if activity is None and planned is None and achieved is None and progress is None:
             continue
-        if _s(r.get("Activities")):
+        if s(activity):
             acts += 1
-        planned_sum += _safe_float(r.get("Planned"))
-        achieved_sum += _safe_float(r.get("Achieved"))
-        p = _parse_progress_percent(_s(r.get("Progress")))
-        if p > 0 or _s(r.get("Progress")):
-            prog_sum += p
+        planned_sum += sf(planned)
+        achieved_sum += sf(achieved)
+        progress_text = s(progress)
+        if progress_text:
+            prog_sum += pp(progress_text)
             prog_n += 1
 
     if acts == 0:
@@ -342,48 +449,118 @@ def _work_progress_summary(rows: Any) -> str:
 # =============================================================================
 # Issues detection + selection
 # =============================================================================
+# (candidate keys, bool value that flags the issue, label) - evaluated in order
+_ISSUE_RULES: Tuple[Tuple[Tuple[str, ...], bool, str], ...] = (
+    (("pipeline_installation_issue", "pipeline_issue"), True, "Pipeline installation/protection deficiencies"),
+    (("leakage_observed", "leakage"), True, "Localized leakages in the distribution network"),
+    (("solar_panel_dust", "dust_panels"), True, "Reduced solar panel efficiency due to dust accumulation"),
+    (("community_training_conducted", "training_conducted"), False, "Lack of formal community training on O&M"),
+)
+
+
 def _detect_issue_labels(row: Dict[str, Any], overrides: Dict[str, Any]) -> List[str]:
-    pipeline_issue = _pick_first_nonempty(row, overrides, ["pipeline_installation_issue", "pipeline_issue"])
-    leakage = _pick_first_nonempty(row, overrides, ["leakage_observed", "leakage"])
-    dust_panels = _pick_first_nonempty(row, overrides, ["solar_panel_dust", "dust_panels"])
-    training = _pick_first_nonempty(row, overrides, ["community_training_conducted", "training_conducted"])
-
-    issues: List[str] = []
-    if _as_yes(pipeline_issue):
-        issues.append("Pipeline installation/protection deficiencies")
-    if _as_yes(leakage):
-        issues.append("Localized leakages in the distribution network")
-    if _as_yes(dust_panels):
-        issues.append("Reduced solar panel efficiency due to dust accumulation")
-    if _as_no(training):
-        issues.append("Lack of formal community training on O&M")
-    return issues
+    return [
+        label
+        for keys, flag, label in _ISSUE_RULES
+        if _parse_bool_like(_pick_first_nonempty(row, overrides, keys)) is flag
+    ]
 
 
 # =============================================================================
 # Generator (advanced: style/tone/format + issue selection + work progress)
 # =============================================================================
-def _tone_phrases(tone: str) -> Dict[str, str]:
-    tone = tone or UIConfig.DEFAULT_TONE
-    if tone == "Formal":
-        return {
-            "p1_open": "This Third-Party Monitoring (TPM) field visit was conducted to assess the technical ",
-            "p3_open": "However, several technical and operational gaps were identified during the monitoring. ",
-            "p4_open": "Overall, the project is functional and delivering water services to the beneficiary community. ",
-            "action_hint": "Timely corrective actions are recommended to mitigate risks and strengthen sustainability.",
-        }
-    if tone == "Action-oriented":
-        return {
-            "p1_open": "This TPM field visit assessed the technical implementation and functionality of the ",
-            "p3_open": "Key gaps requiring immediate follow-up were identified: ",
-            "p4_open": "The project is delivering water services; prioritize corrective actions to improve reliability and sustainability. ",
-            "action_hint": "Follow up with corrective measures, assign responsibilities, and track completion.",
-        }
-    return {
+_TONE_TABLE: Dict[str, Dict[str, str]] = {
+    "Formal": {
+        "p1_open": "This Third-Party Monitoring (TPM) field visit was conducted to assess the technical ",
+        "p3_open": "However, several technical and operational gaps were identified during the monitoring. ",
+        "p4_open": "Overall, the project is functional and delivering water services to the beneficiary community. ",
+        "action_hint": "Timely corrective actions are recommended to mitigate risks and strengthen sustainability.",
+    },
+    "Action-oriented": {
+        "p1_open": "This TPM field visit assessed the technical implementation and functionality of the ",
+        "p3_open": "Key gaps requiring immediate follow-up were identified: ",
+        "p4_open": "The project is delivering water services; prioritize corrective actions to improve reliability and sustainability. ",
+        "action_hint": "Follow up with corrective measures, assign responsibilities, and track completion.",
+    },
+    "Neutral": {
         "p1_open": "This Third-Party Monitoring (TPM) field visit was conducted to assess the technical ",
         "p3_open": "However, several technical and operational gaps were identified during the monitoring. ",
         "p4_open": "Overall, the project is functional and delivering water services to the beneficiary community. ",
         "action_hint": "Addressing the identified gaps through timely corrective actions will further enhance system performance.",
+    },
+}
+
+
+# Style-dependent static paragraphs; unknown styles fall back to Standard
+_P2_BY_STYLE: Dict[str, str] = {
+    "Short": (
+        "The water supply system infrastructure was observed to be constructed and operational, "
+        "with water being supplied to the community and most stand taps functional."
+    ),
+    "Detailed": (
+        "The assessment confirmed that key infrastructure components—including bore wells, a solar-powered pumping system, "
+        "reservoirs, a boundary wall, guard room, latrine, and stand taps—were in place. The system was supplying water "
+        "to the target community, and the majority of stand taps were observed to be functional during the visit."
+    ),
+    "Standard": (
+        "The assessment confirmed that the water supply system infrastructure has been constructed and is currently operational. "
+        "The system is supplying water to the targeted community, and the majority of stand taps were observed to be functional "
+        "at the time of the visit."
+    ),
+}
+
+# p4 = tone p4_open + body (+ tone action_hint when flagged)
+_P4_BY_STYLE: Dict[str, Tuple[str, bool]] = {
+    "Short": ("", True),
+    "Detailed": (
+        "Addressing the identified gaps through corrective actions, strengthening community capacity for operation and maintenance, "
+        "and maintaining routine preventive checks (e.g., leak management and solar panel cleaning) will enhance reliability, safety, "
+        "and the long-term sustainability of services. ",
+        True,
+    ),
+    "Standard": (
+        "Addressing the identified gaps through timely corrective actions and strengthening community capacity will further enhance "
+        "system reliability, operational safety, and sustainability of services.",
+        False,
+    ),
+}
+
+
+# Static paragraph pieces (joined once per build; no f-string temporaries)
+_PROJ_PHRASE = "Solar Water Supply project with household connections"
+_P1_TAIL = "implementation, functionality, and compliance of the "
+_P1_FOCUS = (
+    "The visit focused on verifying operational status, adherence to approved designs and BoQ, "
+    "and identifying risks that may affect long-term system performance."
+)
+_P3_INCLUDE = "These include "
+_P3_TAIL = (
+    ". While minor construction defects may be present in selected works, no critical structural failures were noted "
+    "during the visit."
+)
+_P3_NONE = (
+    "No major technical or operational deficiencies were identified during the monitoring, "
+    "and the system generally complies with the approved technical specifications."
+)
+
+
+def _tone_phrases(tone: str) -> Dict[str, str]:
+    # Shared read-only dicts; unknown tones fall back to Neutral
+    return _TONE_TABLE.get(tone or UIConfig.DEFAULT_TONE, _TONE_TABLE["Neutral"])
+
+
+def _derive_fields(row: Dict[str, Any], overrides: Dict[str, Any]) -> Dict[str, str]:
+    # Shared by the generator and the Insights tab (one pick/normalize pass per rerun)
+    row = row or {}
+    overrides = overrides or {}
+    return {
+        "province": _s(_pick_first_nonempty(row, overrides, ["A01_Province", "province", "Province"])),
+        "district": _s(_pick_first_nonempty(row, overrides, ["A02_District", "district", "District"])),
+        "village": _s(_pick_first_nonempty(row, overrides, ["Village", "village", "Community"])),
+        "project_name": _s(_pick_first_nonempty(row, overrides, ["Activity_Name", "project", "Project_Name"])),
+        "visit_date": _date_only_isoish(_pick_first_nonempty(row, overrides, ["starttime", "visit_date", "Date_of_Visit"])),
+        "status_raw": _norm_phrase(_pick_first_nonempty(row, overrides, ["Project_Status", "project_status", "status"])),
+        "progress_raw": _norm_phrase(_pick_first_nonempty(row, overrides, ["Project_progress", "project_progress", "progress"])),
     }
 
 
@@ -395,35 +572,24 @@ def _build_exec_summary_text_advanced(
     fmt: str,
     issues_selected: List[str],
     include_work_progress: bool,
+    derived: Optional[Dict[str, str]] = None,
+    work_sentence: Optional[str] = None,
 ) -> str:
-    row = row or {}
-    overrides = overrides or {}
-
-    province = _s(_pick_first_nonempty(row, overrides, ["A01_Province", "province", "Province"]))
-    district = _s(_pick_first_nonempty(row, overrides, ["A02_District", "district", "District"]))
-    village = _s(_pick_first_nonempty(row, overrides, ["Village", "village", "Community"]))
-    project_name = _s(_pick_first_nonempty(row, overrides, ["Activity_Name", "project", "Project_Name"]))
-
-    visit_date = _date_only_isoish(_pick_first_nonempty(row, overrides, ["starttime", "visit_date", "Date_of_Visit"]))
-    status_raw = _norm_phrase(_pick_first_nonempty(row, overrides, ["Project_Status", "project_status", "status"]))
-    progress_raw = _norm_phrase(_pick_first_nonempty(row, overrides, ["Project_progress", "project_progress", "progress"]))
+    d = derived if derived is not None else _derive_fields(row, overrides)
+    province, district, village = d["province"], d["district"], d["village"]
+    project_name, visit_date = d["project_name"], d["visit_date"]
+    status_raw, progress_raw = d["status_raw"], d["progress_raw"]
 
     location = _build_location_phrase(village, district, province) or "the monitored location"
-    proj_phrase = (
-        f"Solar Water Supply project with household connections ({project_name})"
-        if project_name
-        else "Solar Water Supply project with household connections"
-    )
-    date_phrase = f" on {visit_date}" if visit_date else ""
+    proj_phrase = "".join((_PROJ_PHRASE, " (", project_name, ")")) if project_name else _PROJ_PHRASE
+    date_phrase = " on " + visit_date if visit_date else ""
 
     tp = _tone_phrases(tone)
-    wp_sentence = _work_progress_summary(st.session_state.get(SS_WORK, [])) if include_work_progress else ""
+    wp_sentence = ""
+    if include_work_progress:
+        wp_sentence = work_sentence if work_sentence is not None else _work_progress_summary(st.session_state.get(SS_WORK, []))
 
-    p1 = (
-        f"{tp['p1_open']}implementation, functionality, and compliance of the {proj_phrase} in {location}{date_phrase}. "
-        "The visit focused on verifying operational status, adherence to approved designs and BoQ, "
-        "and identifying risks that may affect long-term system performance."
-    )
+    p1 = "".join((tp["p1_open"], _P1_TAIL, proj_phrase, " in ", location, date_phrase, ". ", _P1_FOCUS))
 
     bits = []
     if status_raw:
@@ -432,57 +598,19 @@ def _build_exec_summary_text_advanced(
         bits.append(f"Overall progress was reported as {progress_raw}.")
     p_status = " ".join(bits).strip()
 
-    if style == "Short":
-        p2 = (
-            "The water supply system infrastructure was observed to be constructed and operational, "
-            "with water being supplied to the community and most stand taps functional."
-        )
-    elif style == "Detailed":
-        p2 = (
-            "The assessment confirmed that key infrastructure components—including bore wells, a solar-powered pumping system, "
-            "reservoirs, a boundary wall, guard room, latrine, and stand taps—were in place. The system was supplying water "
-            "to the target community, and the majority of stand taps were observed to be functional during the visit."
-        )
-    else:
-        p2 = (
-            "The assessment confirmed that the water supply system infrastructure has been constructed and is currently operational. "
-            "The system is supplying water to the targeted community, and the majority of stand taps were observed to be functional "
-            "at the time of the visit."
-        )
+    p2 = _P2_BY_STYLE.get(style, _P2_BY_STYLE["Standard"])
 
     issues = [i for i in (issues_selected or []) if _s(i)]
     if issues:
         if tone == "Action-oriented":
-            p3 = tp["p3_open"] + ", ".join(issues) + "."
+            p3 = "".join((tp["p3_open"], ", ".join(issues), "."))
         else:
-            p3 = (
-                f"{tp['p3_open']}"
-                "These include " + ", ".join(issues) +
-                ". While minor construction defects may be present in selected works, no critical structural failures were noted "
-                "during the visit."
-            )
+            p3 = "".join((tp["p3_open"], _P3_INCLUDE, ", ".join(issues), _P3_TAIL))
     else:
-        p3 = (
-            "No major technical or operational deficiencies were identified during the monitoring, "
-            "and the system generally complies with the approved technical specifications."
-        )
+        p3 = _P3_NONE
 
-    if style == "Short":
-        p4 = f"{tp['p4_open']}{tp['action_hint']}"
-    elif style == "Detailed":
-        p4 = (
-            f"{tp['p4_open']}"
-            "Addressing the identified gaps through corrective actions, strengthening community capacity for operation and maintenance, "
-            "and maintaining routine preventive checks (e.g., leak management and solar panel cleaning) will enhance reliability, safety, "
-            "and the long-term sustainability of services. "
-            f"{tp['action_hint']}"
-        )
-    else:
-        p4 = (
-            f"{tp['p4_open']}"
-            "Addressing the identified gaps through timely corrective actions and strengthening community capacity will further enhance "
-            "system reliability, operational safety, and sustainability of services."
-        )
+    p4_body, p4_hint = _P4_BY_STYLE.get(style, _P4_BY_STYLE["Standard"])
+    p4 = "".join((tp["p4_open"], p4_body, tp["action_hint"] if p4_hint else ""))
 
     parts: List[str] = [p1]
     if p_status:
@@ -491,15 +619,39 @@ def _build_exec_summary_text_advanced(
         parts.append(wp_sentence)
     parts.extend([p2, p3, p4])
 
-    text = "\n\n".join([_s(x) for x in parts if _s(x)])
+    text = "\n\n".join(x for x in map(_s, parts) if x)
     text = _split_paragraphs(text)
 
     if fmt == "Bullets":
-        bullets = [b.strip() for b in text.split("\n\n") if b.strip()]
+        bullets = [b for b in map(str.strip, text.split("\n\n")) if b]
         return "\n\n".join(bullets)
     return text
 
 
+@st.cache_data(ttl=24 * 60 * 60, max_entries=256, show_spinner=False)
+def _build_exec_cached(
+    derived_items: Tuple[Tuple[str, str], ...],
+    style: str,
+    tone: str,
+    fmt: str,
+    issues: Tuple[str, ...],
+    include_work: bool,
+    work_sentence: str,
+) -> str:
+    # All inputs passed in (no session_state reads) -> identical inputs share one result across sessions
+    return _build_exec_summary_text_advanced(
+        row={},
+        overrides={},
+        style=style,
+        tone=tone,
+        fmt=fmt,
+        issues_selected=list(issues),
+        include_work_progress=include_work,
+        derived=dict(derived_items),
+        work_sentence=work_sentence,
+    )
+
+
 # =============================================================================
 # Translation (pluggable)
 # =============================================================================
@@ -514,6 +666,16 @@ def _get_translate_callable(ctx: Tool6Context):
     return None
 
 
+@st.cache_data(ttl=3600, max_entries=64, show_spinner="Translating…")
+def _translate_cached(_fn, fn_id: str, text_hash: str, _text: str, target: str) -> str:
+    # Underscore args are not hashed by Streamlit: key = (engine id, text digest, target)
+    return _split_paragraphs(_fn(_text, target))
+
+
+def _translate_fn_id(fn) -> str:
+    return f"{getattr(fn, '__qualname__', type(fn).__name__)}@{id(fn)}"
+
+
 def _translate_text(ctx: Tool6Context, text: str, target: str) -> Tuple[str, Optional[str]]:
     t = _split_paragraphs(text)
     if not t:
@@ -528,9 +690,7 @@ def _translate_text(ctx: Tool6Context, text: str, target: str) -> Tuple[str, Opt
         )
 
     try:
-        out = fn(t, target)
-        out = _split_paragraphs(out)
-        return out, None
+        return _translate_cached(fn, _translate_fn_id(fn), _text_digest(t), t, target), None
     except Exception as e:
         return t, f"Translation failed: {e}"
 
@@ -538,57 +698,128 @@ def _translate_text(ctx: Tool6Context, text: str, target: str) -> Tuple[str, Opt
 # =============================================================================
 # Fingerprint + state init (fast)
 # =============================================================================
+# Row / override fields that feed the auto text (order is part of the fingerprint)
+_ROW_FP_KEYS: Tuple[str, ...] = (
+    "A01_Province",
+    "A02_District",
+    "Village",
+    "Activity_Name",
+    "starttime",
+    "Project_Status",
+    "Project_progress",
+    "pipeline_installation_issue",
+    "leakage_observed",
+    "solar_panel_dust",
+    "community_training_conducted",
+)
+_OV_FP_KEYS: Tuple[str, ...] = (
+    "Province",
+    "District",
+    "Village / Community",
+    "Project Name",
+    "Date of Visit",
+    "Project Status",
+    "Project progress",
+)
+
+
+_FP_SEP = b"\x1f"        # between fields
+_FP_GROUP_SEP = b"\x1e"  # closes a variable-length group (issues list, each work row)
+
+
+def _fp_update(h: Any, parts: Iterable[str]) -> None:
+    for part in parts:
+        h.update(part.encode("utf-8", errors="ignore"))
+        h.update(_FP_SEP)
+
+
+def _norm_view(src: Dict[str, Any], keys: Tuple[str, ...]) -> Dict[str, str]:
+    src = src or {}
+    return {k: _fast_s(src.get(k)) for k in keys}
+
+
 def _fingerprint_core(
-    row: Dict[str, Any],
-    overrides: Dict[str, Any],
+    row: Dict[str, str],
+    overrides: Dict[str, str],
     style: str,
     tone: str,
     fmt: str,
     include_work: bool,
     issues_selected: List[str],
 ) -> str:
-    row = row or {}
-    overrides = overrides or {}
+    # Inputs are pre-normalized by the caller (_norm_view / _s): no per-field _s here
 
-    core = [
-        _s(row.get("A01_Province")),
-        _s(row.get("A02_District")),
-        _s(row.get("Village")),
-        _s(row.get("Activity_Name")),
-        _s(row.get("starttime")),
-        _s(row.get("Project_Status")),
-        _s(row.get("Project_progress")),
-
-        _s(row.get("pipeline_installation_issue")),
-        _s(row.get("leakage_observed")),
-        _s(row.get("solar_panel_dust")),
-        _s(row.get("community_training_conducted")),
-
-        _s(overrides.get("Province")),
-        _s(overrides.get("District")),
-        _s(overrides.get("Village / Community")),
-        _s(overrides.get("Project Name")),
-        _s(overrides.get("Date of Visit")),
-        _s(overrides.get("Project Status")),
-        _s(overrides.get("Project progress")),
-
-        _s(style),
-        _s(tone),
-        _s(fmt),
-        "1" if include_work else "0",
-        "|".join([_s(x) for x in (issues_selected or [])]),
-    ]
+    # Stream fields into the hasher (no "|".join temp string)
+    h = hashlib.blake2b(digest_size=16)
+    _fp_update(h, (row.get(k, "") for k in _ROW_FP_KEYS))
+    _fp_update(h, (overrides.get(k, "") for k in _OV_FP_KEYS))
+    _fp_update(h, (style, tone, fmt, "1" if include_work else "0"))
+    _fp_update(h, issues_selected)
+    h.update(_FP_GROUP_SEP)
 
     if include_work:
+        # Work rows folded into the same hasher (no nested digest); group separator closes each row
         work_rows = st.session_state.get(SS_WORK, []) or []
-        sig_parts: List[str] = []
         for r in work_rows[:30]:
             if not isinstance(r, dict):
                 continue
-            sig_parts.extend([_s(r.get("Activities")), _s(r.get("Planned")), _s(r.get("Achieved")), _s(r.get("Progress"))])
-        core.append(_sha1_text("|".join(sig_parts)))
+            _fp_update(h, (_fast_s(r.get("Activities")), _fast_s(r.get("Planned")), _fast_s(r.get("Achieved")), _fast_s(r.get("Progress"))))
+            h.update(_FP_GROUP_SEP)
+
+    return h.hexdigest()
+
+
+def _fast_inputs(
+    row: Dict[str, Any],
+    overrides: Dict[str, Any],
+    style: Any,
+    tone: Any,
+    fmt: Any,
+    include_work: Any,
+    issues_selected: Iterable[Any],
+) -> Tuple[Any, ...]:
+    # Raw (un-normalized) fingerprint inputs; values, not id()s, since overrides/work rows are mutated in place
+    work: Tuple[Any, ...] = ()
+    if include_work:
+        work = tuple(
+            (r.get("Activities"), r.get("Planned"), r.get("Achieved"), r.get("Progress"))
+            for r in (st.session_state.get(SS_WORK, []) or [])[:30]
+            if isinstance(r, dict)
+        )
+    return (
+        tuple(row.get(k) for k in _ROW_FP_KEYS),
+        tuple(overrides.get(k) for k in _OV_FP_KEYS),
+        style,
+        tone,
+        fmt,
+        include_work,
+        tuple(issues_selected),
+        work,
+    )
+
+
+def _same_key(a: Any, b: Any) -> bool:
+    # pd.NA / array-like cells can raise on ==; treat as "changed" and take the full path
+    try:
+        return bool(a == b)
+    except (TypeError, ValueError):
+        return False
+
 
-    return _sha1_text("|".join(core))
+def _detected_issues(ctx: Tool6Context) -> List[str]:
+    # Reuse this rerun's scan from _ensure_state; fall back to a fresh one if it has not run yet
+    detected = st.session_state.get(SS_EXEC_DETECTED)
+    if detected is None:
+        detected = _detect_issue_labels(ctx.row or {}, st.session_state.get(SS_GENERAL_OVERRIDES, {}) or {})
+    return detected
+
+
+def _reset_exec_flags(*, regen: bool = True) -> None:
+    # Back to "auto draft, not confirmed"; regen=True also forces auto text regeneration.
+    flags: Dict[str, Any] = {SS_EXEC_DIRTY: False, SS_EXEC_CONFIRMED: False}
+    if regen:
+        flags[SS_EXEC_HASH] = ""
+    st.session_state.update(flags)
 
 
 def _apply_template(ctx: Tool6Context, template_name: str) -> None:
@@ -600,27 +831,29 @@ def _apply_template(ctx: Tool6Context, template_name: str) -> None:
     ss[SS_EXEC_FORMAT] = tpl.get("format", UIConfig.DEFAULT_FORMAT)
     ss[SS_EXEC_INCLUDE_WORK] = bool(tpl.get("include_work", UIConfig.DEFAULT_INCLUDE_WORK))
 
-    row = ctx.row or {}
-    overrides = ss.get(SS_GENERAL_OVERRIDES, {}) or {}
-    detected = _detect_issue_labels(row, overrides)
-    ss[SS_EXEC_ISSUES_SELECTED] = detected if bool(tpl.get("include_detected_issues", True)) else []
+    detected = _detected_issues(ctx)
+    ss[SS_EXEC_ISSUES_SELECTED] = list(detected) if bool(tpl.get("include_detected_issues", True)) else []
 
-    ss[SS_EXEC_HASH] = ""
-    ss[SS_EXEC_DIRTY] = False
-    ss[SS_EXEC_CONFIRMED] = False
+    _reset_exec_flags()
 
 
-def _ensure_state(ctx: Tool6Context) -> None:
+def _general_overrides() -> Dict[str, Any]:
+    # Mutated in place (session_state holds the reference); replaces a missing/None/non-dict value
     ss = st.session_state
+    gi = ss.get(SS_GENERAL_OVERRIDES)
+    if not isinstance(gi, dict):
+        gi = ss[SS_GENERAL_OVERRIDES] = {}
+    return gi
 
-    # Backward compatibility migration
-    if "tool6_exec_summary_approved" in ss and SS_EXEC_CONFIRMED not in ss:
-        ss[SS_EXEC_CONFIRMED] = bool(ss.get("tool6_exec_summary_approved", False))
+
+def _seed_state_defaults() -> None:
+    ss = st.session_state
 
     ss.setdefault(SS_EXEC_AUTO, "")
+    if SS_EXEC_AUTO_NORM not in ss:
+        ss[SS_EXEC_AUTO_NORM] = _split_paragraphs(ss.get(SS_EXEC_AUTO, ""))
     ss.setdefault(SS_EXEC_HASH, "")
 
-    ss.setdefault(SS_EXEC_CONFIRMED, False)
     ss.setdefault(SS_EXEC_DIRTY, False)
 
     ss.setdefault(SS_EXEC_STYLE, UIConfig.DEFAULT_STYLE)
@@ -632,14 +865,12 @@ def _ensure_state(ctx: Tool6Context) -> None:
     if not isinstance(ss.get(SS_EXEC_ISSUES_SELECTED), list):
         ss[SS_EXEC_ISSUES_SELECTED] = []
 
-    ss.setdefault(SS_EXEC_SHOW_DIFF, False)
-
     ss.setdefault(SS_EXEC_TEMPLATE, UIConfig.DEFAULT_TEMPLATE)
     if ss[SS_EXEC_TEMPLATE] not in TEMPLATE_LIBRARY:
         ss[SS_EXEC_TEMPLATE] = UIConfig.DEFAULT_TEMPLATE
 
     ss.setdefault(SS_EXEC_TRANSLATE_TARGET, "Persian/Dari")
-    if ss[SS_EXEC_TRANSLATE_TARGET] not in UIConfig.TRANSLATE_TARGETS:
+    if ss[SS_EXEC_TRANSLATE_TARGET] not in _TR_TARGET_IDX:
         ss[SS_EXEC_TRANSLATE_TARGET] = "Persian/Dari"
 
     ss.setdefault(SS_EXEC_TRANSLATE_SOURCE, "Edited")
@@ -649,63 +880,109 @@ def _ensure_state(ctx: Tool6Context) -> None:
     ss.setdefault(SS_STEP6_READY, False)
     ss.setdefault(SS_NAV_NEXT_REQUESTED, False)
 
-    # RAW/FINAL init (safe)
-    ss.setdefault(SS_EXEC_TEXT_RAW, "")
     ss.setdefault(SS_EXEC_TEXT, "")
 
+
+def _ensure_state(ctx: Tool6Context) -> None:
+    ss = st.session_state
+
+    # Backward compatibility migration
+    if "tool6_exec_summary_approved" in ss and SS_EXEC_CONFIRMED not in ss:
+        ss[SS_EXEC_CONFIRMED] = bool(ss.get("tool6_exec_summary_approved", False))
+
+    # Widget-bound keys: Streamlit drops these while the step is not rendered, so re-seed every run
+    ss.setdefault(SS_EXEC_CONFIRMED, False)
+    ss.setdefault(SS_EXEC_SHOW_DIFF, False)
+    ss.setdefault(SS_EXEC_TEXT_RAW, "")
+
+    # Plain session keys only need seeding once per session; regen/template actions
+    # invalidate through SS_EXEC_HASH (part of the fast key below), not through this guard
+    if not ss.get(SS_S6_STATE_READY):
+        _seed_state_defaults()
+        ss[SS_S6_STATE_READY] = True
+
     row = ctx.row or {}
     overrides = ss.get(SS_GENERAL_OVERRIDES, {}) or {}
+    ss[SS_EXEC_DERIVED] = _derive_fields(row, overrides)
+    ss[SS_EXEC_DETECTED] = _detect_issue_labels(row, overrides)
 
     # default issues selection only once
     if ss.get(SS_EXEC_ISSUES_SELECTED) == [] and (not ss.get(SS_EXEC_HASH)):
-        ss[SS_EXEC_ISSUES_SELECTED] = _detect_issue_labels(row, overrides)
+        ss[SS_EXEC_ISSUES_SELECTED] = list(ss[SS_EXEC_DETECTED])
+
+    # fast path: same raw inputs and hash as the last full check -> nothing to normalize, hash or rebuild
+    fast_key = (
+        ss.get(SS_EXEC_HASH),
+        _fast_inputs(
+            row,
+            overrides,
+            ss.get(SS_EXEC_STYLE),
+            ss.get(SS_EXEC_TONE),
+            ss.get(SS_EXEC_FORMAT),
+            ss.get(SS_EXEC_INCLUDE_WORK),
+            ss.get(SS_EXEC_ISSUES_SELECTED, []) or [],
+        ),
+    )
+    if not _same_key(ss.get(SS_EXEC_FAST_KEY), fast_key):
+        _refresh_auto_text(row, overrides)
+        ss[SS_EXEC_FAST_KEY] = (ss.get(SS_EXEC_HASH), fast_key[1])
+
+    # Ensure FINAL follows RAW on first load (only if user hasn't typed)
+    if (not _s(ss.get(SS_EXEC_TEXT))) and _s(ss.get(SS_EXEC_TEXT_RAW)):
+        ss[SS_EXEC_TEXT] = _split_paragraphs(ss.get(SS_EXEC_TEXT_RAW))
+
+
+def _refresh_auto_text(row: Dict[str, Any], overrides: Dict[str, Any]) -> None:
+    ss = st.session_state
+
+    # Normalize once; shared by the fingerprint and the generator
+    style = _s(ss.get(SS_EXEC_STYLE))
+    tone = _s(ss.get(SS_EXEC_TONE))
+    fmt = _s(ss.get(SS_EXEC_FORMAT))
+    include_work = bool(ss.get(SS_EXEC_INCLUDE_WORK))
+    issues_raw = ss.get(SS_EXEC_ISSUES_SELECTED, []) or []
 
     # fingerprint + regen only when changed
     h = _fingerprint_core(
-        row=row,
-        overrides=overrides,
-        style=_s(ss.get(SS_EXEC_STYLE)),
-        tone=_s(ss.get(SS_EXEC_TONE)),
-        fmt=_s(ss.get(SS_EXEC_FORMAT)),
-        include_work=bool(ss.get(SS_EXEC_INCLUDE_WORK)),
-        issues_selected=ss.get(SS_EXEC_ISSUES_SELECTED, []) or [],
+        row=_norm_view(row, _ROW_FP_KEYS),
+        overrides=_norm_view(overrides, _OV_FP_KEYS),
+        style=style,
+        tone=tone,
+        fmt=fmt,
+        include_work=include_work,
+        issues_selected=[_s(x) for x in issues_raw],
     )
 
     if ss.get(SS_EXEC_HASH) != h:
-        auto_text = _build_exec_summary_text_advanced(
-            row=row,
-            overrides=overrides,
-            style=_s(ss.get(SS_EXEC_STYLE)),
-            tone=_s(ss.get(SS_EXEC_TONE)),
-            fmt=_s(ss.get(SS_EXEC_FORMAT)),
-            issues_selected=ss.get(SS_EXEC_ISSUES_SELECTED, []) or [],
-            include_work_progress=bool(ss.get(SS_EXEC_INCLUDE_WORK)),
+        # Not memoized on h: the fingerprint does not cover every generator input (alias keys,
+        # long work tables). _build_exec_cached is keyed on the derived values themselves.
+        derived = ss.get(SS_EXEC_DERIVED) or _derive_fields(row, overrides)
+        auto_text = _build_exec_cached(
+            derived_items=tuple(derived.items()),
+            style=style,
+            tone=tone,
+            fmt=fmt,
+            issues=tuple(issues_raw),
+            include_work=include_work,
+            work_sentence=_work_progress_summary(ss.get(SS_WORK, [])) if include_work else "",
         )
         ss[SS_EXEC_HASH] = h
         ss[SS_EXEC_AUTO] = auto_text
+        ss[SS_EXEC_AUTO_NORM] = _split_paragraphs(auto_text)
 
         # initialize RAW/FNAL if empty AND not dirty/confirmed
         if (not bool(ss.get(SS_EXEC_DIRTY))) and (ss.get(SS_EXEC_CONFIRMED) is False):
             if not _s(ss.get(SS_EXEC_TEXT_RAW)):
                 ss[SS_EXEC_TEXT_RAW] = auto_text
             if not _s(ss.get(SS_EXEC_TEXT)):
-                ss[SS_EXEC_TEXT] = _split_paragraphs(auto_text)
-
-    # Ensure FINAL follows RAW on first load (only if user hasn't typed)
-    if (not _s(ss.get(SS_EXEC_TEXT))) and _s(ss.get(SS_EXEC_TEXT_RAW)):
-        ss[SS_EXEC_TEXT] = _split_paragraphs(ss.get(SS_EXEC_TEXT_RAW))
+                ss[SS_EXEC_TEXT] = ss[SS_EXEC_AUTO_NORM]
 
 
 # =============================================================================
 # UI: CSS once + card system
 # =============================================================================
-def _inject_ui_css_once() -> None:
-    ss = st.session_state
-    if ss.get(SS_S6_CSS_DONE):
-        return
-
-    st.markdown(
-        f"""
+# Rendered once at import; only the session guard runs per rerun
+_CSS_BLOB = f"""
 <style>
 .t6-s6-wrap {{
   max-width: {UIConfig.MAX_CONTENT_WIDTH_PX}px;
@@ -766,12 +1043,21 @@ div[data-testid="column"] {{
   margin-bottom: 0.2rem;
 }}
 </style>
-""",
-        unsafe_allow_html=True,
-    )
+"""
+
+
+def _inject_ui_css_once() -> None:
+    ss = st.session_state
+    if ss.get(SS_S6_CSS_DONE):
+        return
+
+    st.markdown(_CSS_BLOB, unsafe_allow_html=True)
     ss[SS_S6_CSS_DONE] = True
 
 
+_PILL_TPL = "<div class='t6-s6-pill'>{}: {}</div>"
+
+
 def _card(title: str, body_fn, *, help_text: str = "") -> None:
     # Unified card wrapper (consistent edges + theme tokens)
     with pure_glass_panel(title=title, subtitle=help_text, variant="default", divider=False):
@@ -789,21 +1075,18 @@ def _sticky_bar(ctx: Tool6Context) -> None:
     a1, a2, a3, a4, a5, a6 = st.columns([1.15, 1.15, 1.15, 1.35, 1.05, 1.15], gap="small")
 
     with a1:
-        if st.button("Regenerate", use_container_width=True, key=_key("regen")):
-            ss[SS_EXEC_HASH] = ""
-            ss[SS_EXEC_DIRTY] = False
-            ss[SS_EXEC_CONFIRMED] = False
+        if st.button("Regenerate", use_container_width=True, key=_K_REGEN):
+            _reset_exec_flags()
             # Reset RAW to auto on regenerate (safe because this happens before widget is instantiated on rerun)
             ss[SS_EXEC_TEXT_RAW] = ""
             ss[SS_EXEC_TEXT] = ""
             st.rerun()
 
     with a2:
-        if st.button("Reset to Auto", use_container_width=True, key=_key("reset_auto")):
+        if st.button("Reset to Auto", use_container_width=True, key=_K_RESET_AUTO):
             ss[SS_EXEC_TEXT_RAW] = ss.get(SS_EXEC_AUTO, "")
-            ss[SS_EXEC_TEXT] = _split_paragraphs(ss.get(SS_EXEC_AUTO, ""))
-            ss[SS_EXEC_DIRTY] = False
-            ss[SS_EXEC_CONFIRMED] = False
+            ss[SS_EXEC_TEXT] = ss.get(SS_EXEC_AUTO_NORM, "")
+            _reset_exec_flags(regen=False)
             st.rerun()
 
     with a3:
@@ -833,6 +1116,9 @@ def _draft_tab(ctx: Tool6Context) -> None:
 
     left, right = st.columns([1.05, 0.95], gap="large")
     locked = bool(ss.get(SS_EXEC_CONFIRMED, False))
+    auto_text = ss.get(SS_EXEC_AUTO, "")
+    # Filled by the editor, read by the preview (same rerun) -> no session_state round-trip
+    state: Dict[str, Any] = {"text": ss.get(SS_EXEC_TEXT, ""), "dirty": bool(ss.get(SS_EXEC_DIRTY))}
 
     def _editor_body():
         height = UIConfig.EDITOR_HEIGHT_MOBILE if st.session_state.get("t6_is_mobile") is True else UIConfig.EDITOR_HEIGHT_DESKTOP
@@ -848,29 +1134,39 @@ def _draft_tab(ctx: Tool6Context) -> None:
 
         edited_norm = _split_paragraphs(edited_raw)
 
-        # SAFE: update FINAL (not the widget key)
-        ss[SS_EXEC_TEXT] = edited_norm
+        # str != already short-circuits on length; the win is not re-normalizing auto text per keystroke
+        dirty = edited_norm != ss.get(SS_EXEC_AUTO_NORM, "")
 
-        auto_norm = _split_paragraphs(ss.get(SS_EXEC_AUTO, ""))
-        ss[SS_EXEC_DIRTY] = (edited_norm != auto_norm)
+        # SAFE: update FINAL (not the widget key)
+        ss.update({SS_EXEC_TEXT: edited_norm, SS_EXEC_DIRTY: dirty})
+        state["text"] = edited_norm
+        state["dirty"] = dirty
 
-        words = len([w for w in re.split(r"\s+", edited_norm) if w.strip()]) if edited_norm else 0
-        chars = len(edited_norm) if edited_norm else 0
+        words = len(edited_norm.split()) if edited_norm else 0
+        chars = len(edited_norm)
         st.markdown(f"<div class='t6-s6-subtle'>Words: {words} · Characters: {chars}</div>", unsafe_allow_html=True)
 
         if bool(ss.get(SS_EXEC_SHOW_DIFF, False)):
             st.divider()
-            st.code(_simple_diff(ss.get(SS_EXEC_AUTO, ""), edited_norm), language="text")
+            # Non-edit reruns (other widgets) re-show the same pair: reuse the last diff
+            pair = (auto_text, edited_norm)
+            memo = ss.get(SS_EXEC_DIFF_MEMO)
+            if memo is not None and memo[0] == pair:
+                diff = memo[1]
+            else:
+                diff = _simple_diff(*pair)
+                ss[SS_EXEC_DIFF_MEMO] = (pair, diff)
+            st.code(diff, language="text")
 
     def _preview_body():
         st.caption("This preview approximates the report reading flow.")
-        _render_preview(ss.get(SS_EXEC_TEXT, ""), fmt=_s(ss.get(SS_EXEC_FORMAT)))
+        _render_preview(state["text"], fmt=_s(ss.get(SS_EXEC_FORMAT)), normalized=True)
 
         st.divider()
-        if ss.get(SS_EXEC_CONFIRMED):
+        if locked:
             status_card("Confirmed", "This exact text will be used in the generated DOCX.", level="success")
         else:
-            if ss.get(SS_EXEC_DIRTY):
+            if state["dirty"]:
                 status_card("Edited (not confirmed)", "You edited the text. Confirm when final.", level="warning")
             else:
                 status_card("Auto draft", "This matches the latest auto-generated version.", level="info")
@@ -881,21 +1177,14 @@ def _draft_tab(ctx: Tool6Context) -> None:
         _card("Live Preview", _preview_body, help_text="Preview updates with your edits.")
 
 
-def _insights_tab(ctx: Tool6Context) -> None:
+def _insights_tab(ctx: Tool6Context, detected: List[str]) -> None:
     ss = st.session_state
-    row = ctx.row or {}
-    overrides = ss.get(SS_GENERAL_OVERRIDES, {}) or {}
-
-    province = _s(_pick_first_nonempty(row, overrides, ["A01_Province", "province", "Province"]))
-    district = _s(_pick_first_nonempty(row, overrides, ["A02_District", "district", "District"]))
-    village = _s(_pick_first_nonempty(row, overrides, ["Village", "village", "Community"]))
-    project_name = _s(_pick_first_nonempty(row, overrides, ["Activity_Name", "project", "Project_Name"]))
-    visit_date = _date_only_isoish(_pick_first_nonempty(row, overrides, ["starttime", "visit_date", "Date_of_Visit"]))
-    status_raw = _norm_phrase(_pick_first_nonempty(row, overrides, ["Project_Status", "project_status", "status"]))
-    progress_raw = _norm_phrase(_pick_first_nonempty(row, overrides, ["Project_progress", "project_progress", "progress"]))
+    d = ss.get(SS_EXEC_DERIVED) or _derive_fields(ctx.row or {}, ss.get(SS_GENERAL_OVERRIDES, {}) or {})
+    province, district, village = d["province"], d["district"], d["village"]
+    project_name, visit_date = d["project_name"], d["visit_date"]
+    status_raw, progress_raw = d["status_raw"], d["progress_raw"]
 
     loc = _build_location_phrase(village, district, province)
-    detected = _detect_issue_labels(row, overrides)
 
     def _kpis_body():
         k1, k2, k3, k4 = st.columns([1.25, 1.25, 1.25, 1.25], gap="small")
@@ -904,12 +1193,16 @@ def _insights_tab(ctx: Tool6Context) -> None:
         k3.metric("Visit date", visit_date or "—")
         k4.metric("Project progress", progress_raw or "—")
 
-        st.markdown("<div class='t6-s6-row'>", unsafe_allow_html=True)
-        st.markdown(f"<div class='t6-s6-pill'>Location: {loc or '—'}</div>", unsafe_allow_html=True)
-        st.markdown(f"<div class='t6-s6-pill'>Project: {project_name or '—'}</div>", unsafe_allow_html=True)
-        st.markdown(f"<div class='t6-s6-pill'>Status: {status_raw or '—'}</div>", unsafe_allow_html=True)
-        st.markdown(f"<div class='t6-s6-pill'>Confirmed: {'Yes' if ss.get(SS_EXEC_CONFIRMED) else 'No'}</div>", unsafe_allow_html=True)
-        st.markdown("</div>", unsafe_allow_html=True)
+        pills = (
+            ("Location", loc or "—"),
+            ("Project", project_name or "—"),
+            ("Status", status_raw or "—"),
+            ("Confirmed", "Yes" if ss.get(SS_EXEC_CONFIRMED) else "No"),
+        )
+        st.markdown(
+            "".join(("<div class='t6-s6-row'>", *(_PILL_TPL.format(k, v) for k, v in pills), "</div>")),
+            unsafe_allow_html=True,
+        )
 
     def _issues_body():
         if detected:
@@ -933,33 +1226,30 @@ def _insights_tab(ctx: Tool6Context) -> None:
     _card("Work progress (Step 5)", _work_body)
 
 
-def _controls_tab(ctx: Tool6Context) -> None:
+def _controls_tab(ctx: Tool6Context, detected: List[str]) -> None:
     ss = st.session_state
-    row = ctx.row or {}
-    overrides = ss.get(SS_GENERAL_OVERRIDES, {}) or {}
-    detected = _detect_issue_labels(row, overrides)
 
     locked = bool(ss.get(SS_EXEC_CONFIRMED, False))
 
     def _tpl_body():
-        opts = list(TEMPLATE_LIBRARY.keys())
+        opts = _TEMPLATE_NAMES
         t1, t2, t3 = st.columns([2.2, 1.0, 1.0], gap="small")
 
         with t1:
             ss[SS_EXEC_TEMPLATE] = st.selectbox(
                 "Choose a template",
                 options=opts,
-                index=_safe_index(opts, _s(ss.get(SS_EXEC_TEMPLATE)), UIConfig.DEFAULT_TEMPLATE),
-                key=_key("tpl_name"),
+                index=_TEMPLATE_INDEX.get(_s(ss.get(SS_EXEC_TEMPLATE)), _TEMPLATE_INDEX[UIConfig.DEFAULT_TEMPLATE]),
+                key=_K_TPL_NAME,
                 disabled=locked,
             )
 
         with t2:
-            if st.button("Apply Template", use_container_width=True, key=_key("tpl_apply"), disabled=locked):
+            if st.button("Apply Template", use_container_width=True, key=_K_TPL_APPLY, disabled=locked):
                 _apply_template(ctx, ss[SS_EXEC_TEMPLATE])
                 # Apply immediately to RAW+FINAL (safe because rerun re-instantiates widgets)
                 ss[SS_EXEC_TEXT_RAW] = ss.get(SS_EXEC_AUTO, "")
-                ss[SS_EXEC_TEXT] = _split_paragraphs(ss.get(SS_EXEC_AUTO, ""))
+                ss[SS_EXEC_TEXT] = ss.get(SS_EXEC_AUTO_NORM, "")
                 st.rerun()
 
         with t3:
@@ -973,59 +1263,54 @@ def _controls_tab(ctx: Tool6Context) -> None:
 
     def _controls_body():
         c1, c2, c3 = st.columns([1.2, 1.2, 1.2], gap="small")
-        style_opts = ["Short", "Standard", "Detailed"]
-        tone_opts = ["Neutral", "Formal", "Action-oriented"]
-        fmt_opts = ["Paragraphs", "Bullets"]
-
         with c1:
             ss[SS_EXEC_STYLE] = st.selectbox(
                 "Style",
-                options=style_opts,
-                index=_safe_index(style_opts, _s(ss.get(SS_EXEC_STYLE)), UIConfig.DEFAULT_STYLE),
-                key=_key("style"),
+                options=_STYLES,
+                index=_STYLE_IDX.get(_s(ss.get(SS_EXEC_STYLE)), _STYLE_IDX[UIConfig.DEFAULT_STYLE]),
+                key=_K_STYLE,
                 disabled=locked,
             )
         with c2:
             ss[SS_EXEC_TONE] = st.selectbox(
                 "Tone",
-                options=tone_opts,
-                index=_safe_index(tone_opts, _s(ss.get(SS_EXEC_TONE)), UIConfig.DEFAULT_TONE),
-                key=_key("tone"),
+                options=_TONES,
+                index=_TONE_IDX.get(_s(ss.get(SS_EXEC_TONE)), _TONE_IDX[UIConfig.DEFAULT_TONE]),
+                key=_K_TONE,
                 disabled=locked,
             )
         with c3:
             ss[SS_EXEC_FORMAT] = st.selectbox(
                 "Output format",
-                options=fmt_opts,
-                index=_safe_index(fmt_opts, _s(ss.get(SS_EXEC_FORMAT)), UIConfig.DEFAULT_FORMAT),
-                key=_key("format"),
+                options=_FORMATS,
+                index=_FMT_IDX.get(_s(ss.get(SS_EXEC_FORMAT)), _FMT_IDX[UIConfig.DEFAULT_FORMAT]),
+                key=_K_FORMAT,
                 disabled=locked,
             )
 
         s1, s2 = st.columns([2.2, 1.0], gap="small")
         with s1:
             selected = ss.get(SS_EXEC_ISSUES_SELECTED, []) or []
-            opts = sorted(list(set(detected + selected)))
+            # Order-preserving dedupe: detected issues first (rule order), then any custom selections
+            opts = list(dict.fromkeys(detected + selected))
             ss[SS_EXEC_ISSUES_SELECTED] = st.multiselect(
                 "Include issues in auto text",
                 options=opts,
                 default=selected,
-                key=_key("issues_sel"),
+                key=_K_ISSUES_SEL,
                 disabled=locked,
             )
         with s2:
             ss[SS_EXEC_INCLUDE_WORK] = st.toggle(
                 "Include Step 5 summary",
                 value=bool(ss.get(SS_EXEC_INCLUDE_WORK, UIConfig.DEFAULT_INCLUDE_WORK)),
-                key=_key("include_work"),
+                key=_K_INCLUDE_WORK,
                 disabled=locked,
             )
 
-        if st.button("Update Auto Draft (apply controls)", use_container_width=True, key=_key("apply_controls"), disabled=locked):
-            ss[SS_EXEC_HASH] = ""
+        if st.button("Update Auto Draft (apply controls)", use_container_width=True, key=_K_APPLY_CONTROLS, disabled=locked):
             # regenerate in next run then sync RAW+FINAL from auto if not dirty
-            ss[SS_EXEC_DIRTY] = False
-            ss[SS_EXEC_CONFIRMED] = False
+            _reset_exec_flags()
             ss[SS_EXEC_TEXT_RAW] = ""
             ss[SS_EXEC_TEXT] = ""
             st.rerun()
@@ -1037,40 +1322,41 @@ def _controls_tab(ctx: Tool6Context) -> None:
         tr1, tr2, tr3, tr4 = st.columns([1.2, 1.2, 1.4, 1.2], gap="small")
 
         with tr1:
-            src_opts = ["Edited", "Auto"]
             ss[SS_EXEC_TRANSLATE_SOURCE] = st.selectbox(
                 "Translate source",
-                options=src_opts,
-                index=_safe_index(src_opts, _s(ss.get(SS_EXEC_TRANSLATE_SOURCE)), "Edited"),
-                key=_key("tr_source"),
+                options=_TR_SOURCES,
+                index=_TR_SOURCE_IDX.get(_s(ss.get(SS_EXEC_TRANSLATE_SOURCE)), _TR_SOURCE_IDX["Edited"]),
+                key=_K_TR_SOURCE,
                 disabled=locked,
             )
         with tr2:
-            tgt_opts = UIConfig.TRANSLATE_TARGETS
             ss[SS_EXEC_TRANSLATE_TARGET] = st.selectbox(
                 "Target language",
-                options=tgt_opts,
-                index=_safe_index(tgt_opts, _s(ss.get(SS_EXEC_TRANSLATE_TARGET)), "Persian/Dari"),
-                key=_key("tr_target"),
+                options=UIConfig.TRANSLATE_TARGETS,
+                index=_TR_TARGET_IDX.get(_s(ss.get(SS_EXEC_TRANSLATE_TARGET)), _TR_TARGET_IDX["Persian/Dari"]),
+                key=_K_TR_TARGET,
                 disabled=locked,
             )
         with tr3:
-            if st.button("Translate Now", use_container_width=True, key=_key("tr_now"), disabled=locked):
+            if st.button("Translate Now", use_container_width=True, key=_K_TR_NOW, disabled=locked):
+                target = ss[SS_EXEC_TRANSLATE_TARGET]
                 source_text = ss.get(SS_EXEC_TEXT, "") if ss[SS_EXEC_TRANSLATE_SOURCE] == "Edited" else ss.get(SS_EXEC_AUTO, "")
-                translated, warn = _translate_text(ctx, source_text, ss[SS_EXEC_TRANSLATE_TARGET])
+                translated, warn = _translate_text(ctx, source_text, target)
 
                 if warn:
                     status_card("Translation not configured", warn, level="warning")
                 else:
                     # Apply translation into RAW+FINAL (safe via rerun)
-                    ss[SS_EXEC_TEXT_RAW] = translated
-                    ss[SS_EXEC_TEXT] = _split_paragraphs(translated)
-                    ss[SS_EXEC_DIRTY] = True
-                    ss[SS_EXEC_CONFIRMED] = False
-
-                    gi = ss.get(SS_GENERAL_OVERRIDES, {}) or {}
-                    gi[f"Executive Summary Text ({ss[SS_EXEC_TRANSLATE_TARGET]})"] = ss[SS_EXEC_TEXT]
-                    ss[SS_GENERAL_OVERRIDES] = gi
+                    translated_norm = _split_paragraphs(translated)
+                    ss.update({
+                        SS_EXEC_TEXT_RAW: translated,
+                        SS_EXEC_TEXT: translated_norm,
+                        SS_EXEC_DIRTY: True,
+                        SS_EXEC_CONFIRMED: False,
+                    })
+
+                    gi = _general_overrides()
+                    gi[f"Executive Summary Text ({target})"] = translated_norm
                     st.rerun()
 
         with tr4:
@@ -1101,26 +1387,42 @@ def render_step(ctx: Tool6Context) -> bool:
     _ensure_state(ctx)
     ss = st.session_state
 
+    # Detected once per rerun (in _ensure_state); shared by Insights + Controls
+    detected = _detected_issues(ctx)
+
     st.markdown("<div class='t6-s6-wrap'>", unsafe_allow_html=True)
 
     with st.container(border=True):
         _sticky_bar(ctx)
 
-        tab_draft, tab_insights, tab_controls = st.tabs(["Draft", "Insights", "Controls"])
-        with tab_draft:
+        # st.tabs builds every tab each rerun; a view switcher builds only the visible one.
+        # Horizontal radio (not segmented_control): it cannot be deselected, so control and view always agree
+        view = st.radio(
+            "View",
+            options=_VIEWS,
+            index=_VIEW_IDX.get(_s(ss.get(SS_EXEC_VIEW)), 0),
+            key=_K_VIEW,
+            horizontal=True,
+            label_visibility="collapsed",
+        )
+        ss[SS_EXEC_VIEW] = view
+
+        if view == "Draft":
             _draft_tab(ctx)
-        with tab_insights:
-            _insights_tab(ctx)
-        with tab_controls:
-            _controls_tab(ctx)
+        else:
+            # Editor is not instantiated: re-assign its widget-owned key so Streamlit keeps the user's text
+            ss[SS_EXEC_TEXT_RAW] = ss.get(SS_EXEC_TEXT_RAW, "")
+            if view == "Insights":
+                _insights_tab(ctx, detected)
+            else:
+                _controls_tab(ctx, detected)
 
-        # FINAL value already synced in _draft_tab from RAW
-        final_text = _split_paragraphs(_s(ss.get(SS_EXEC_TEXT)))
+        # FINAL value already synced (and normalized) in _draft_tab from RAW
+        final_text = _s(ss.get(SS_EXEC_TEXT))
 
         # Save to overrides for report builder
-        gi = ss.get(SS_GENERAL_OVERRIDES, {}) or {}
+        gi = _general_overrides()
         gi["Executive Summary Text"] = final_text
-        ss[SS_GENERAL_OVERRIDES] = gi
 
         # Gate readiness
         confirmed = bool(ss.get(SS_EXEC_CONFIRMED, False))
@@ -1143,4 +1445,4 @@ def render_step(ctx: Tool6Context) -> bool:
     st.markdown("</div>", unsafe_allow_html=True)
 
     # IMPORTANT: do NOT allow next unless confirmed + non-empty
-    return bool(ss.get(SS_STEP6_READY, False))
+    return ready
@@ -3,7 +3,10 @@ from __future__ import annotations
 
 import hashlib
 import re
-from typing import Any, Dict, List, Optional, Tuple
+from difflib import unified_diff
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import streamlit as st
 
@@ -17,10 +20,11 @@ from design.components.base_tool_ui import card_close, status_card
 # =============================================================================
 SS_CONFIRMED = "tool6_dcm_confirmed"
 SS_LIST_TEXT = "tool6_dcm_list_text"
+SS_LIST_ITEMS = "tool6_dcm_list_items"  # canonical cleaned lines of SS_LIST_TEXT (tuple)
 SS_NARR_TEXT = "tool6_dcm_narrative_text"
 
 # Perf/cache (auto text)
-SS_DCM_HASH = "tool6_dcm_hash"
+SS_DCM_HASH = "tool6_dcm_hash"  # (flags tuple, style, tone) of the cached auto text; "" forces regen
 SS_DCM_AUTO_LIST = "tool6_dcm_auto_list"
 SS_DCM_AUTO_NARR = "tool6_dcm_auto_narr"
 
@@ -51,11 +55,14 @@ SS_NAV_NEXT_REQUESTED = "tool6_nav_next_requested"
 # CSS injected guard
 SS_S7_CSS_DONE = "tool6_s7_css_done"
 
+# One-time defaults guard for _ensure_state (id() of the overrides dict it seeded)
+SS_S7_STATE_READY = "tool6_s7_state_ready"
+
 
 # =============================================================================
 # Flags (must match report_sections/data_collection_methods.py)
 # =============================================================================
-FLAGS: List[Tuple[str, str]] = [
+FLAGS: Tuple[Tuple[str, str], ...] = (
     ("D0_direct_observation", "Direct technical observation"),
     ("D0_key_informant_interview", "Key informant interviews (CDC/IP/Contractor)"),
     ("D0_photos_taken", "Geo-referenced photos were taken"),
@@ -67,10 +74,10 @@ FLAGS: List[Tuple[str, str]] = [
     ("D3_geophysical_tests_available", "Geophysical/Hydrological tests available"),
     ("D4_water_quality_tests_available", "Water quality tests available"),
     ("D4_pump_test_results_available", "Pump test results available"),
-]
+)
 
 # Optional modern “new-tech” methods (stored in overrides)
-EXTRA_METHODS: List[Tuple[str, str]] = [
+EXTRA_METHODS: Tuple[Tuple[str, str], ...] = (
     ("D0_drone_imagery", "Drone imagery / aerial visual verification (if feasible)"),
     ("D0_mobile_gis", "Mobile GIS / digital forms with geotagging (ODK/Kobo-like)"),
     ("D0_remote_validation", "Remote validation (photos/video call) when access is constrained"),
@@ -78,7 +85,11 @@ EXTRA_METHODS: List[Tuple[str, str]] = [
     ("D0_stakeholder_fgd", "Focused group discussions (community users)"),
     ("D0_risk_checklist", "Structured risk checklist / compliance scoring"),
     ("D0_triangulation", "Triangulation across sources (field + docs + stakeholders)"),
-]
+)
+
+
+# Every flag the generator reads, in a fixed order (positions of the cache-key tuple)
+_ALL_FLAG_KEYS: Tuple[str, ...] = tuple(k for k, _ in (FLAGS + EXTRA_METHODS))
 
 
 # =============================================================================
@@ -110,94 +121,112 @@ TEMPLATE_LIBRARY: Dict[str, Dict[str, Any]] = {
     "Action Follow-up (Action-oriented)": {"style": "Standard", "tone": "Action-oriented", "preview": "Numbered"},
 }
 
+# Selectbox options + O(1) index lookups (static; not rebuilt per rerun)
+_STYLES: Tuple[str, ...] = ("Short", "Standard", "Detailed")
+_STYLE_IDX: Dict[str, int] = {v: i for i, v in enumerate(_STYLES)}
+
+_TONES: Tuple[str, ...] = ("Neutral", "Formal", "Action-oriented")
+_TONE_IDX: Dict[str, int] = {v: i for i, v in enumerate(_TONES)}
+
+_PREVIEW_MODES: Tuple[str, ...] = ("Numbered", "Bullets")
+_PREVIEW_IDX: Dict[str, int] = {v: i for i, v in enumerate(_PREVIEW_MODES)}
+
+_TR_SOURCES: Tuple[str, ...] = ("Edited", "Auto")
+_TR_SOURCE_IDX: Dict[str, int] = {v: i for i, v in enumerate(_TR_SOURCES)}
+
+_TR_TARGETS: Tuple[str, ...] = tuple(UIConfig.TRANSLATE_TARGETS)
+_TR_TARGET_IDX: Dict[str, int] = {v: i for i, v in enumerate(_TR_TARGETS)}
+
+_TEMPLATE_NAMES: Tuple[str, ...] = tuple(TEMPLATE_LIBRARY.keys())
+_TEMPLATE_INDEX: Dict[str, int] = {n: i for i, n in enumerate(_TEMPLATE_NAMES)}
+
 
 # =============================================================================
 # Helpers (fast, pure)
 # =============================================================================
-def _s(v: Any) -> str:
-    return "" if v is None else str(v).strip()
+# Collapses 3+ consecutive newlines into a single blank line (paragraph break)
+_MULTI_NL_RE = re.compile(r"\n{3,}")
 
 
-def _sha1(text: str) -> str:
-    return hashlib.sha1(text.encode("utf-8", errors="ignore")).hexdigest()
+def _s(v: Any) -> str:
+    return "" if v is None else str(v).strip()
 
 
+@lru_cache(maxsize=256)
 def _key(*parts: Any) -> str:
     raw = ".".join(str(p) for p in parts)
-    h = hashlib.md5(raw.encode("utf-8", errors="ignore")).hexdigest()
+    h = hashlib.blake2b(raw.encode("utf-8", errors="ignore"), digest_size=16).hexdigest()
     return f"t6.s7.{h}"
 
 
+# Widget keys (all-literal parts): hashed once at import, not per rerun
+_K_REGEN = _key("regen")
+_K_RESET_AUTO = _key("reset_auto")
+_K_LIST_TEXT = _key("list_text")
+_K_NARR_TEXT = _key("narr_text")
+_K_TPL_NAME = _key("tpl_name")
+_K_TPL_APPLY = _key("tpl_apply")
+_K_STYLE = _key("style")
+_K_TONE = _key("tone")
+_K_PREVIEW_MODE = _key("preview_mode")
+_K_TR_SOURCE = _key("tr_source")
+_K_TR_TARGET = _key("tr_target")
+_K_TR_NOW = _key("tr_now")
+_FLAG_WIDGET_KEYS: Dict[str, str] = {k: _key("flag", k) for k in _ALL_FLAG_KEYS}
+
+
+# Pure str -> value helpers below are re-run on the same editor/auto text every rerun: memoize
+@lru_cache(maxsize=64)
 def _split_paragraphs(text: str) -> str:
     t = (text or "").replace("\r\n", "\n")
     t = "\n".join([ln.rstrip() for ln in t.split("\n")])
-    while "\n\n\n" in t:
-        t = t.replace("\n\n\n", "\n\n")
-    return t.strip()
+    return _MULTI_NL_RE.sub("\n\n", t).strip()
 
 
-def _lines(text: str) -> List[str]:
-    return [ln.strip() for ln in (text or "").splitlines() if ln.strip()]
+# Non-empty stripped lines (the editor hands back the same text on most reruns)
+@lru_cache(maxsize=32)
+def _clean_lines(text: str) -> Tuple[str, ...]:
+    return tuple(filter(None, map(str.strip, text.splitlines())))
 
 
+@lru_cache(maxsize=128)
 def _word_char_count(text: str) -> Tuple[int, int]:
     t = _s(text)
     if not t:
         return 0, 0
-    words = len([w for w in re.split(r"\s+", t) if w.strip()])
+    words = len(t.split())
     return words, len(t)
 
 
+@lru_cache(maxsize=64)
 def _simple_diff(a: str, b: str, max_lines: int = 140) -> str:
     a_lines = (a or "").splitlines()
     b_lines = (b or "").splitlines()
 
-    out: List[str] = ["Legend: - removed | + added |   unchanged", ""]
-    i = 0
-    j = 0
-
-    while i < len(a_lines) and j < len(b_lines) and len(out) < max_lines:
-        if a_lines[i] == b_lines[j]:
-            out.append(f"  {a_lines[i]}")
-            i += 1
-            j += 1
-        else:
-            out.append(f"- {a_lines[i]}")
-            out.append(f"+ {b_lines[j]}")
-            i += 1
-            j += 1
-
-    while i < len(a_lines) and len(out) < max_lines:
-        out.append(f"- {a_lines[i]}")
-        i += 1
-    while j < len(b_lines) and len(out) < max_lines:
-        out.append(f"+ {b_lines[j]}")
-        j += 1
+    # Real line alignment (SequenceMatcher) + lazy generator capped at max_lines (+1 to detect truncation)
+    diff = list(
+        islice(
+            unified_diff(a_lines, b_lines, fromfile="auto", tofile="edited", lineterm="", n=3),
+            max_lines + 1,
+        )
+    )
+    if not diff:
+        return "(no differences)"
 
-    if len(out) >= max_lines:
-        out.extend(["", "… diff truncated …"])
+    out: List[str] = ["Legend: - removed | + added |   unchanged", ""]
+    out.extend(diff[:max_lines])
+    if len(diff) > max_lines:
+        out.append("")
+        out.append("… diff truncated …")
 
     return "\n".join(out)
 
 
-def _safe_index(options: List[str], value: str, default_value: str) -> int:
-    v = value if value in options else default_value
-    try:
-        return options.index(v)
-    except Exception:
-        return 0
-
-
 # =============================================================================
 # UI styling (inject once to reduce flicker)
 # =============================================================================
-def _inject_ui_css_once() -> None:
-    ss = st.session_state
-    if ss.get(SS_S7_CSS_DONE):
-        return
-
-    st.markdown(
-        f"""
+# Rendered once at import; only the session guard runs per rerun
+_CSS_BLOB = f"""
 <style>
 .t6-s7-wrap {{
   max-width: {UIConfig.MAX_CONTENT_WIDTH_PX}px;
@@ -265,12 +294,21 @@ div[data-testid="stNumberInput"] input {{
   margin-bottom: 0.2rem;
 }}
 </style>
-""",
-        unsafe_allow_html=True,
-    )
+"""
+
+
+def _inject_ui_css_once() -> None:
+    ss = st.session_state
+    if ss.get(SS_S7_CSS_DONE):
+        return
+
+    st.markdown(_CSS_BLOB, unsafe_allow_html=True)
     ss[SS_S7_CSS_DONE] = True
 
 
+_PILL_TPL = "<div class='t6-s7-pill'>{}: {}</div>"
+
+
 def _card(title: str, body_fn, *, help_text: str = "") -> None:
     # Unified card wrapper (consistent edges + theme tokens)
     with pure_glass_panel(title=title, subtitle=help_text, variant="default", divider=False):
@@ -292,6 +330,20 @@ def _get_translate_callable(ctx: Tool6Context):
     return None
 
 
+@st.cache_data(ttl=3600, max_entries=64, show_spinner="Translating…")
+def _translate_cached(_fn, fn_id: str, text_hash: str, _text: str, target: str) -> str:
+    # Underscore args are not hashed by Streamlit: key = (engine id, text digest, target)
+    return _s(_fn(_text, target))
+
+
+def _translate_fn_id(fn) -> str:
+    return f"{getattr(fn, '__qualname__', type(fn).__name__)}@{id(fn)}"
+
+
+def _text_digest(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8", errors="ignore"), digest_size=16).hexdigest()
+
+
 def _translate_text(ctx: Tool6Context, text: str, target: str) -> Tuple[str, Optional[str]]:
     t = _split_paragraphs(text)
     if not t:
@@ -304,7 +356,7 @@ def _translate_text(ctx: Tool6Context, text: str, target: str) -> Tuple[str, Opt
             "Register a callable in st.session_state['tool6_translate_fn'] that accepts (text, target) -> str."
         )
     try:
-        out = fn(t, target)
+        out = _translate_cached(fn, _translate_fn_id(fn), _text_digest(t), t, target)
         return _split_paragraphs(out), None
     except Exception as e:
         return t, f"Translation failed: {e}"
@@ -313,20 +365,39 @@ def _translate_text(ctx: Tool6Context, text: str, target: str) -> Tuple[str, Opt
 # =============================================================================
 # State init
 # =============================================================================
+def _general_overrides() -> Dict[str, Any]:
+    # Mutated in place (session_state holds the reference); replaces a missing/None/non-dict value
+    ss = st.session_state
+    gi = ss.get("general_info_overrides")
+    if not isinstance(gi, dict):
+        gi = ss["general_info_overrides"] = {}
+    return gi
+
+
 def _ensure_state() -> None:
     ss = st.session_state
+
+    # Widget-bound keys: Streamlit drops these while the step is not rendered, so re-seed every run
     ss.setdefault(SS_CONFIRMED, False)
+    ss.setdefault(SS_DCM_SHOW_ONLY_SELECTED, False)
+    ss.setdefault(SS_DCM_SHOW_DIFF, False)
+
+    # Everything else only needs seeding once per overrides dict: the marker is the id() of the dict
+    # the last seeding ran against, so a fresh dict from Step 2 is seeded again
+    ovr = _general_overrides()
+    if ss.get(SS_S7_STATE_READY) == id(ovr):
+        return
+
     ss.setdefault(SS_LIST_TEXT, "")
+    ss.setdefault(SS_LIST_ITEMS, _clean_lines(_s(ss.get(SS_LIST_TEXT))))
     ss.setdefault(SS_NARR_TEXT, "")
 
     ss.setdefault(SS_DCM_HASH, "")
-    ss.setdefault(SS_DCM_AUTO_LIST, [])
+    ss.setdefault(SS_DCM_AUTO_LIST, ())
     ss.setdefault(SS_DCM_AUTO_NARR, "")
 
     ss.setdefault(SS_DCM_DIRTY_LIST, False)
     ss.setdefault(SS_DCM_DIRTY_NARR, False)
-    ss.setdefault(SS_DCM_SHOW_ONLY_SELECTED, False)
-    ss.setdefault(SS_DCM_SHOW_DIFF, False)
 
     ss.setdefault(SS_DCM_STYLE, UIConfig.DEFAULT_STYLE)
     ss.setdefault(SS_DCM_TONE, UIConfig.DEFAULT_TONE)
@@ -337,11 +408,11 @@ def _ensure_state() -> None:
         ss[SS_DCM_TEMPLATE] = UIConfig.DEFAULT_TEMPLATE
 
     ss.setdefault(SS_DCM_TRANSLATE_TARGET, "Persian/Dari")
-    if ss[SS_DCM_TRANSLATE_TARGET] not in UIConfig.TRANSLATE_TARGETS:
+    if ss[SS_DCM_TRANSLATE_TARGET] not in _TR_TARGET_IDX:
         ss[SS_DCM_TRANSLATE_TARGET] = "Persian/Dari"
 
     ss.setdefault(SS_DCM_TRANSLATE_SOURCE, "Edited")
-    if ss[SS_DCM_TRANSLATE_SOURCE] not in ("Edited", "Auto"):
+    if ss[SS_DCM_TRANSLATE_SOURCE] not in _TR_SOURCES:
         ss[SS_DCM_TRANSLATE_SOURCE] = "Edited"
 
     ss.setdefault(SS_DCM_UI_MOBILE, False)
@@ -350,37 +421,29 @@ def _ensure_state() -> None:
     ss.setdefault(SS_STEP7_READY, False)
     ss.setdefault(SS_NAV_NEXT_REQUESTED, False)
 
-    ss.setdefault("general_info_overrides", {})
-    ovr = ss["general_info_overrides"]
-
-    for k, _ in FLAGS:
-        ovr.setdefault(k, False)
-    for k, _ in EXTRA_METHODS:
+    for k in _ALL_FLAG_KEYS:
         ovr.setdefault(k, False)
 
-    ss["general_info_overrides"] = ovr
+    ss[SS_S7_STATE_READY] = id(ovr)
 
 
 # =============================================================================
 # Generation logic
 # =============================================================================
-def _build_doc_review_phrase(ovr: Dict[str, Any], style: str) -> str:
-    reviewed: List[str] = []
-    if bool(ovr.get("D2_boq_available")):
-        reviewed.append("Bill of Quantities (BOQ)")
-    if bool(ovr.get("D2_drawings_available")):
-        reviewed.append("approved technical drawings")
-    if bool(ovr.get("D1_contract_available")):
-        reviewed.append("contract documents")
-    if bool(ovr.get("D1_journal_available")):
-        reviewed.append("site journal and progress records")
-    if bool(ovr.get("D3_geophysical_tests_available")):
-        reviewed.append("geophysical and hydrological test reports")
-    if bool(ovr.get("D4_water_quality_tests_available")):
-        reviewed.append("water quality test results")
-    if bool(ovr.get("D4_pump_test_results_available")):
-        reviewed.append("pump test results")
+# Document flags -> phrase used in the review sentence (order is the order they are listed)
+_DOC_REVIEW_ITEMS: Tuple[Tuple[str, str], ...] = (
+    ("D2_boq_available", "Bill of Quantities (BOQ)"),
+    ("D2_drawings_available", "approved technical drawings"),
+    ("D1_contract_available", "contract documents"),
+    ("D1_journal_available", "site journal and progress records"),
+    ("D3_geophysical_tests_available", "geophysical and hydrological test reports"),
+    ("D4_water_quality_tests_available", "water quality test results"),
+    ("D4_pump_test_results_available", "pump test results"),
+)
 
+
+def _build_doc_review_phrase(ovr: Dict[str, Any], style: str) -> str:
+    reviewed = [label for key, label in _DOC_REVIEW_ITEMS if ovr.get(key)]
     if not reviewed:
         return ""
 
@@ -391,25 +454,28 @@ def _build_doc_review_phrase(ovr: Dict[str, Any], style: str) -> str:
     return "Review of project documentation, including " + ", ".join(reviewed) + "."
 
 
-def _tone_bits(tone: str) -> Dict[str, str]:
-    tone = tone or UIConfig.DEFAULT_TONE
-    if tone == "Formal":
-        return {
-            "opening": "The Third-Party Monitoring (TPM) assessment was conducted using a structured mixed-methods approach, ",
-            "focus": "The monitoring emphasized verification of construction quality, system performance, and compliance with approved designs and contractual requirements. ",
-            "closing": "Evidence was assessed across applicable project components, and findings were analyzed and linked to corrective actions in line with UNICEF WASH standards and TPM protocols.",
-        }
-    if tone == "Action-oriented":
-        return {
-            "opening": "The TPM assessment applied a structured mixed-methods approach to enable clear verification and follow-up, ",
-            "focus": "The monitoring prioritized actionable verification of quality, functionality, and compliance, and aimed to surface risks that require corrective action. ",
-            "closing": "Evidence was reviewed across applicable components and translated into clear findings with practical follow-up actions aligned with UNICEF WASH standards and TPM protocols.",
-        }
-    return {
+# Static per-tone sentence parts (shared; treat as read-only)
+_TONE_BITS: Dict[str, Dict[str, str]] = {
+    "Formal": {
+        "opening": "The Third-Party Monitoring (TPM) assessment was conducted using a structured mixed-methods approach, ",
+        "focus": "The monitoring emphasized verification of construction quality, system performance, and compliance with approved designs and contractual requirements. ",
+        "closing": "Evidence was assessed across applicable project components, and findings were analyzed and linked to corrective actions in line with UNICEF WASH standards and TPM protocols.",
+    },
+    "Action-oriented": {
+        "opening": "The TPM assessment applied a structured mixed-methods approach to enable clear verification and follow-up, ",
+        "focus": "The monitoring prioritized actionable verification of quality, functionality, and compliance, and aimed to surface risks that require corrective action. ",
+        "closing": "Evidence was reviewed across applicable components and translated into clear findings with practical follow-up actions aligned with UNICEF WASH standards and TPM protocols.",
+    },
+    "Neutral": {
         "opening": "The Third-Party Monitoring (TPM) assessment was conducted using a structured mixed-methods approach, ",
         "focus": "The monitoring focused on verifying construction quality, functionality, and compliance with approved designs and contractual requirements, while identifying risks that may affect performance and sustainability. ",
         "closing": "Evidence was assessed across applicable project components, and findings were analyzed and linked to practical corrective actions in line with UNICEF WASH standards and TPM protocols.",
-    }
+    },
+}
+
+
+def _tone_bits(tone: str) -> Dict[str, str]:
+    return _TONE_BITS.get(tone or UIConfig.DEFAULT_TONE, _TONE_BITS["Neutral"])
 
 
 def _auto_generate_methods_list(ovr: Dict[str, Any], style: str, tone: str) -> List[str]:
@@ -496,19 +562,6 @@ def _auto_generate_narrative_dynamic(ovr: Dict[str, Any], style: str, tone: str)
     checklist = bool(ovr.get("D0_risk_checklist"))
     triang = bool(ovr.get("D0_triangulation"))
 
-    any_docs = any(
-        bool(ovr.get(k))
-        for k in [
-            "D1_contract_available",
-            "D1_journal_available",
-            "D2_boq_available",
-            "D2_drawings_available",
-            "D3_geophysical_tests_available",
-            "D4_water_quality_tests_available",
-            "D4_pump_test_results_available",
-        ]
-    )
-
     if style == "Short":
         opening = tb["opening"] + "combining field verification, documentation review, and stakeholder engagement where applicable."
     elif style == "Detailed":
@@ -556,10 +609,9 @@ def _auto_generate_narrative_dynamic(ovr: Dict[str, Any], style: str, tone: str)
     if triang:
         tech_bits.append("Triangulation across sources strengthened validity of observations and conclusions.")
 
-    if any_docs:
-        doc_phrase = _build_doc_review_phrase(ovr, style=style)
-        doc_sentence = doc_phrase if doc_phrase else "Project documentation was reviewed to validate compliance with approved specifications and contractual requirements."
-    else:
+    # The phrase is non-empty exactly when any _DOC_REVIEW_ITEMS flag is set: one pass over the doc flags
+    doc_sentence = _build_doc_review_phrase(ovr, style=style)
+    if not doc_sentence:
         doc_sentence = (
             "Documentary evidence was limited during the visit."
             if style == "Short"
@@ -585,16 +637,14 @@ def _auto_generate_narrative_dynamic(ovr: Dict[str, Any], style: str, tone: str)
     focus = tb["focus"]
     closing = tb["closing"]
 
+    # One flat join (no inner " ".join per group); all fragments are single-line literals,
+    # so strip() is all the paragraph normalization this text needs
     if style == "Short":
-        narrative = " ".join([opening, focus, closing])
+        parts = [opening, focus, closing]
     else:
-        narrative = " ".join(
-            [opening, " ".join(field_bits)]
-            + ([" ".join(tech_bits)] if tech_bits else [])
-            + [doc_sentence, stakeholder_sentence, focus, closing]
-        )
+        parts = [opening, *field_bits, *tech_bits, doc_sentence, stakeholder_sentence, focus, closing]
 
-    return _split_paragraphs(narrative)
+    return " ".join(parts).strip()
 
 
 def _auto_generate(ovr: Dict[str, Any], style: str, tone: str) -> Tuple[List[str], str]:
@@ -604,18 +654,38 @@ def _auto_generate(ovr: Dict[str, Any], style: str, tone: str) -> Tuple[List[str
     )
 
 
-def _fingerprint_core(ovr: Dict[str, Any], style: str, tone: str) -> str:
-    parts = [f"{k}={int(bool(ovr.get(k)))}" for k, _ in (FLAGS + EXTRA_METHODS)]
-    parts.extend([f"style={_s(style)}", f"tone={_s(tone)}"])
-    return _sha1("|".join(parts))
+def _flags_tuple(ovr: Dict[str, Any]) -> Tuple[bool, ...]:
+    return tuple(bool(ovr.get(k)) for k in _ALL_FLAG_KEYS)
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _auto_generate_cached(flags: Tuple[bool, ...], style: str, tone: str) -> Tuple[Tuple[str, ...], str]:
+    # Pure in (flags, style, tone): the generators only read these flag keys from ovr
+    methods, narrative = _auto_generate(dict(zip(_ALL_FLAG_KEYS, flags)), style=style, tone=tone)
+    return tuple(methods), narrative
+
 
+def _fingerprint_core(ovr: Dict[str, Any], style: str, tone: str) -> Tuple[Tuple[bool, ...], str, str]:
+    # Plain tuple: compared with == (no string building / hashing); "" in SS_DCM_HASH never matches.
+    # style/tone are pre-normalized by the caller (_s): no second conversion here
+    return _flags_tuple(ovr), style, tone
 
-def _compute_and_cache_auto_text(ovr: Dict[str, Any]) -> Tuple[List[str], str]:
+
+def _store_list_items(items: Tuple[str, ...]) -> None:
+    # Items are the canonical form; the joined text only feeds the editor, diff and overrides
     ss = st.session_state
-    fp = _fingerprint_core(ovr, style=_s(ss.get(SS_DCM_STYLE)), tone=_s(ss.get(SS_DCM_TONE)))
+    ss[SS_LIST_ITEMS] = items
+    ss[SS_LIST_TEXT] = "\n".join(items)
+
+
+def _compute_and_cache_auto_text(ovr: Dict[str, Any]) -> Tuple[Tuple[str, ...], str]:
+    ss = st.session_state
+    style = _s(ss.get(SS_DCM_STYLE))
+    tone = _s(ss.get(SS_DCM_TONE))
+    fp = _fingerprint_core(ovr, style=style, tone=tone)
 
     if ss.get(SS_DCM_HASH) != fp:
-        methods, narrative = _auto_generate(ovr, style=_s(ss.get(SS_DCM_STYLE)), tone=_s(ss.get(SS_DCM_TONE)))
+        methods, narrative = _auto_generate_cached(*fp)
         ss[SS_DCM_HASH] = fp
         ss[SS_DCM_AUTO_LIST] = methods
         ss[SS_DCM_AUTO_NARR] = narrative
@@ -623,11 +693,11 @@ def _compute_and_cache_auto_text(ovr: Dict[str, Any]) -> Tuple[List[str], str]:
         # Never clobber edits if confirmed; otherwise update live if not dirty
         if not bool(ss.get(SS_CONFIRMED, False)):
             if not bool(ss.get(SS_DCM_DIRTY_LIST, False)):
-                ss[SS_LIST_TEXT] = "\n".join(methods)
+                _store_list_items(methods)
             if not bool(ss.get(SS_DCM_DIRTY_NARR, False)):
                 ss[SS_NARR_TEXT] = narrative
 
-    return ss.get(SS_DCM_AUTO_LIST, []) or [], _s(ss.get(SS_DCM_AUTO_NARR))
+    return tuple(ss.get(SS_DCM_AUTO_LIST, ()) or ()), _s(ss.get(SS_DCM_AUTO_NARR))
 
 
 def _apply_template(template_name: str) -> None:
@@ -647,27 +717,25 @@ def _apply_template(template_name: str) -> None:
 # =============================================================================
 # Rendering helpers
 # =============================================================================
-def _render_methods_preview(items: List[str], mode: str) -> None:
+def _render_methods_preview(items: Sequence[str], mode: str) -> None:
     if not items:
         st.info("No methods to preview.")
         return
 
+    # One markdown element for the whole list (not one per item)
     mode = mode or UIConfig.DEFAULT_PREVIEW
     if mode == "Bullets":
-        for it in items:
-            st.markdown(f"- {it}")
+        st.markdown("\n".join(f"- {it}" for it in items))
     else:
-        for i, it in enumerate(items, start=1):
-            st.markdown(f"{i}. {it}")
+        st.markdown("\n".join(f"{i}. {it}" for i, it in enumerate(items, start=1)))
 
 
 def _sync_ovr_from_widget_state(ovr: Dict[str, Any], widget_key: str, flag_key: str) -> None:
     ovr[flag_key] = bool(st.session_state.get(widget_key, False))
 
 
-def _widget_fp_for_selections(ovr: Dict[str, Any]) -> str:
-    parts = [f"{k}={int(bool(ovr.get(k)))}" for k, _ in (FLAGS + EXTRA_METHODS)]
-    return _sha1("|".join(parts))
+def _widget_fp_for_selections(ovr: Dict[str, Any]) -> Tuple[bool, ...]:
+    return _flags_tuple(ovr)
 
 
 # =============================================================================
@@ -679,14 +747,14 @@ def _sticky_bar() -> None:
     a1, a2, a3, a4, a5, a6 = st.columns([1.15, 1.15, 1.2, 1.2, 1.2, 1.3], gap="small")
 
     with a1:
-        if st.button("Regenerate", use_container_width=True, key=_key("regen")):
+        if st.button("Regenerate", use_container_width=True, key=_K_REGEN):
             ss[SS_DCM_HASH] = ""
             ss[SS_DCM_DIRTY_LIST] = False
             ss[SS_DCM_DIRTY_NARR] = False
             ss[SS_CONFIRMED] = False
 
     with a2:
-        if st.button("Reset to Auto", use_container_width=True, key=_key("reset_auto")):
+        if st.button("Reset to Auto", use_container_width=True, key=_K_RESET_AUTO):
             ss[SS_DCM_DIRTY_LIST] = False
             ss[SS_DCM_DIRTY_NARR] = False
             ss[SS_CONFIRMED] = False
@@ -721,13 +789,10 @@ def _draft_left_panel(ovr: Dict[str, Any]) -> None:
     show_only = bool(ss.get(SS_DCM_SHOW_ONLY_SELECTED, False))
     locked = bool(ss.get(SS_CONFIRMED, False))
 
-    def _flag_widget_key(flag_key: str) -> str:
-        return _key("flag", flag_key)
-
-    def _render_group(title: str, items: List[Tuple[str, str]], *, expanded: bool = True) -> None:
+    def _render_group(title: str, items: Tuple[Tuple[str, str], ...], *, expanded: bool = True) -> None:
         with st.expander(title, expanded=expanded):
             for flag_key, label in items:
-                wkey = _flag_widget_key(flag_key)
+                wkey = _FLAG_WIDGET_KEYS[flag_key]
                 if wkey not in ss:
                     ss[wkey] = bool(ovr.get(flag_key, False))
                 if show_only and not bool(ss.get(wkey, False)):
@@ -786,7 +851,7 @@ def _draft_right_panel(ctx: Tool6Context, ovr: Dict[str, Any]) -> None:
                 "Methods",
                 list_text_current,
                 UIConfig.LIST_EDITOR_HEIGHT,
-                _key("list_text"),
+                _K_LIST_TEXT,
                 "Each non-empty line becomes one item in the report.",
                 locked,
             )
@@ -795,18 +860,20 @@ def _draft_right_panel(ctx: Tool6Context, ovr: Dict[str, Any]) -> None:
                 "Narrative",
                 narr_text_current,
                 UIConfig.NARR_EDITOR_HEIGHT,
-                _key("narr_text"),
+                _K_NARR_TEXT,
                 "Write one coherent paragraph (blank lines allowed).",
                 locked,
             )
 
-        new_list_norm = "\n".join(_lines(new_list))
+        new_items = _clean_lines(new_list)
         new_narr_norm = _split_paragraphs(new_narr)
 
-        ss[SS_LIST_TEXT] = new_list_norm
+        _store_list_items(new_items)
         ss[SS_NARR_TEXT] = new_narr_norm
+        new_list_norm = ss[SS_LIST_TEXT]
 
-        ss[SS_DCM_DIRTY_LIST] = _split_paragraphs(new_list_norm) != _split_paragraphs("\n".join(auto_list))
+        # Cleaned lines joined by "\n" are already paragraph-normalized: compare the items directly
+        ss[SS_DCM_DIRTY_LIST] = new_items != auto_list
         ss[SS_DCM_DIRTY_NARR] = _split_paragraphs(new_narr_norm) != _split_paragraphs(auto_narr)
 
         w1, c1 = _word_char_count(new_list_norm)
@@ -820,7 +887,7 @@ def _draft_right_panel(ctx: Tool6Context, ovr: Dict[str, Any]) -> None:
     _card("2) Edit text", _body, help_text="Everything updates immediately. Confirm when final.")
 
     def _preview_body():
-        items = _lines(_s(ss.get(SS_LIST_TEXT))) or auto_list
+        items = ss.get(SS_LIST_ITEMS) or auto_list
         _render_methods_preview(items, mode=_s(ss.get(SS_DCM_PREVIEW_MODE)))
         st.markdown("---")
         st.write(_split_paragraphs(_s(ss.get(SS_NARR_TEXT))) or auto_narr)
@@ -847,20 +914,20 @@ def _controls_tab(ctx: Tool6Context, ovr: Dict[str, Any]) -> None:
     ss = st.session_state
 
     def _tpl_body():
-        opts = list(TEMPLATE_LIBRARY.keys())
+        opts = _TEMPLATE_NAMES
         t1, t2, t3 = st.columns([2.2, 1.0, 1.0], gap="small")
 
         with t1:
             ss[SS_DCM_TEMPLATE] = st.selectbox(
                 "Choose a template",
                 options=opts,
-                index=_safe_index(opts, _s(ss.get(SS_DCM_TEMPLATE)), UIConfig.DEFAULT_TEMPLATE),
-                key=_key("tpl_name"),
+                index=_TEMPLATE_INDEX.get(_s(ss.get(SS_DCM_TEMPLATE)), _TEMPLATE_INDEX[UIConfig.DEFAULT_TEMPLATE]),
+                key=_K_TPL_NAME,
                 help="Templates set style/tone/preview; you can still edit text afterwards.",
             )
 
         with t2:
-            if st.button("Apply Template", use_container_width=True, key=_key("tpl_apply")):
+            if st.button("Apply Template", use_container_width=True, key=_K_TPL_APPLY):
                 _apply_template(ss[SS_DCM_TEMPLATE])
                 ss[SS_DCM_HASH] = ""
 
@@ -872,31 +939,27 @@ def _controls_tab(ctx: Tool6Context, ovr: Dict[str, Any]) -> None:
                 st.write(f"Preview: {tpl.get('preview')}")
 
     def _style_body():
-        style_opts = ["Short", "Standard", "Detailed"]
-        tone_opts = ["Neutral", "Formal", "Action-oriented"]
-        prev_opts = ["Numbered", "Bullets"]
-
         c1, c2, c3 = st.columns([1.2, 1.2, 1.2], gap="small")
         with c1:
             ss[SS_DCM_STYLE] = st.selectbox(
                 "Style",
-                options=style_opts,
-                index=_safe_index(style_opts, _s(ss.get(SS_DCM_STYLE)), UIConfig.DEFAULT_STYLE),
-                key=_key("style"),
+                options=_STYLES,
+                index=_STYLE_IDX.get(_s(ss.get(SS_DCM_STYLE)), _STYLE_IDX[UIConfig.DEFAULT_STYLE]),
+                key=_K_STYLE,
             )
         with c2:
             ss[SS_DCM_TONE] = st.selectbox(
                 "Tone",
-                options=tone_opts,
-                index=_safe_index(tone_opts, _s(ss.get(SS_DCM_TONE)), UIConfig.DEFAULT_TONE),
-                key=_key("tone"),
+                options=_TONES,
+                index=_TONE_IDX.get(_s(ss.get(SS_DCM_TONE)), _TONE_IDX[UIConfig.DEFAULT_TONE]),
+                key=_K_TONE,
             )
         with c3:
             ss[SS_DCM_PREVIEW_MODE] = st.selectbox(
                 "Preview mode",
-                options=prev_opts,
-                index=_safe_index(prev_opts, _s(ss.get(SS_DCM_PREVIEW_MODE)), UIConfig.DEFAULT_PREVIEW),
-                key=_key("preview_mode"),
+                options=_PREVIEW_MODES,
+                index=_PREVIEW_IDX.get(_s(ss.get(SS_DCM_PREVIEW_MODE)), _PREVIEW_IDX[UIConfig.DEFAULT_PREVIEW]),
+                key=_K_PREVIEW_MODE,
             )
 
         st.caption("Changes apply instantly to the auto draft (unless you have edited/confirmed).")
@@ -909,25 +972,24 @@ def _controls_tab(ctx: Tool6Context, ovr: Dict[str, Any]) -> None:
 
     def _translate_body():
         tr1, tr2, tr3, tr4 = st.columns([1.2, 1.2, 1.4, 1.2], gap="small")
-        src_opts = ["Edited", "Auto"]
-        tgt_opts = UIConfig.TRANSLATE_TARGETS
+        tgt_opts = _TR_TARGETS
 
         with tr1:
             ss[SS_DCM_TRANSLATE_SOURCE] = st.selectbox(
                 "Translate source",
-                options=src_opts,
-                index=_safe_index(src_opts, _s(ss.get(SS_DCM_TRANSLATE_SOURCE)), "Edited"),
-                key=_key("tr_source"),
+                options=_TR_SOURCES,
+                index=_TR_SOURCE_IDX.get(_s(ss.get(SS_DCM_TRANSLATE_SOURCE)), _TR_SOURCE_IDX["Edited"]),
+                key=_K_TR_SOURCE,
             )
         with tr2:
             ss[SS_DCM_TRANSLATE_TARGET] = st.selectbox(
                 "Target language",
                 options=tgt_opts,
-                index=_safe_index(tgt_opts, _s(ss.get(SS_DCM_TRANSLATE_TARGET)), "Persian/Dari"),
-                key=_key("tr_target"),
+                index=_TR_TARGET_IDX.get(_s(ss.get(SS_DCM_TRANSLATE_TARGET)), _TR_TARGET_IDX["Persian/Dari"]),
+                key=_K_TR_TARGET,
             )
         with tr3:
-            if st.button("Translate Now", use_container_width=True, key=_key("tr_now")):
+            if st.button("Translate Now", use_container_width=True, key=_K_TR_NOW):
                 al, an = _compute_and_cache_auto_text(ovr)
 
                 if ss[SS_DCM_TRANSLATE_SOURCE] == "Edited":
@@ -944,17 +1006,16 @@ def _controls_tab(ctx: Tool6Context, ovr: Dict[str, Any]) -> None:
                 if warn:
                     status_card("Translation not configured", warn, level="warning")
                 else:
-                    ss[SS_LIST_TEXT] = "\n".join(_lines(t_list))
+                    _store_list_items(_clean_lines(t_list))
                     ss[SS_NARR_TEXT] = _split_paragraphs(t_narr)
                     ss[SS_DCM_DIRTY_LIST] = True
                     ss[SS_DCM_DIRTY_NARR] = True
                     ss[SS_CONFIRMED] = False
 
                     tgt = _s(ss.get(SS_DCM_TRANSLATE_TARGET))
-                    gi = ss.get("general_info_overrides", {}) or {}
+                    gi = _general_overrides()
                     gi[f"D_methods_list_text ({tgt})"] = ss[SS_LIST_TEXT]
                     gi[f"D_methods_narrative_text ({tgt})"] = ss[SS_NARR_TEXT]
-                    ss["general_info_overrides"] = gi
 
         with tr4:
             with st.popover("How to enable", use_container_width=True):
@@ -981,10 +1042,14 @@ def _insights_tab(ovr: Dict[str, Any]) -> None:
         c2.metric("Style", _s(ss.get(SS_DCM_STYLE)) or "—")
         c3.metric("Tone", _s(ss.get(SS_DCM_TONE)) or "—")
 
-        st.markdown("<div class='t6-s7-row'>", unsafe_allow_html=True)
-        st.markdown(f"<div class='t6-s7-pill'>Preview: {_s(ss.get(SS_DCM_PREVIEW_MODE)) or UIConfig.DEFAULT_PREVIEW}</div>", unsafe_allow_html=True)
-        st.markdown(f"<div class='t6-s7-pill'>Confirmed: {'Yes' if ss.get(SS_CONFIRMED) else 'No'}</div>", unsafe_allow_html=True)
-        st.markdown("</div>", unsafe_allow_html=True)
+        pills = (
+            ("Preview", _s(ss.get(SS_DCM_PREVIEW_MODE)) or UIConfig.DEFAULT_PREVIEW),
+            ("Confirmed", "Yes" if ss.get(SS_CONFIRMED) else "No"),
+        )
+        st.markdown(
+            "".join(("<div class='t6-s7-row'>", *(_PILL_TPL.format(k, v) for k, v in pills), "</div>")),
+            unsafe_allow_html=True,
+        )
 
     _card("Snapshot", _snap_body)
 
@@ -1027,7 +1092,7 @@ def render_step(ctx: Tool6Context) -> bool:
     _ensure_state()
 
     ss = st.session_state
-    ovr: Dict[str, Any] = ss.get("general_info_overrides", {}) or {}
+    ovr: Dict[str, Any] = _general_overrides()
 
     st.markdown("<div class='t6-s7-wrap'>", unsafe_allow_html=True)
     with st.container(border=True):
@@ -1051,13 +1116,12 @@ def render_step(ctx: Tool6Context) -> bool:
         # Final save to overrides
         auto_list, auto_narr = _compute_and_cache_auto_text(ovr)
 
-        final_items = _lines(_s(ss.get(SS_LIST_TEXT))) or auto_list
+        final_items = ss.get(SS_LIST_ITEMS) or auto_list
         final_list_text = "\n".join(final_items)
         final_narr_text = _s(ss.get(SS_NARR_TEXT)) or auto_narr
 
         ovr["D_methods_list_text"] = final_list_text
         ovr["D_methods_narrative_text"] = final_narr_text
-        ss["general_info_overrides"] = ovr
 
         st.divider()
 